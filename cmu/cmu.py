@@ -7,6 +7,7 @@ from pathlib import Path
 DATA_DIR = Path(__file__).parent
 INDEX_URL = "https://ml.cmu.edu/peopleindexes/phd-students-index.v1.json"
 CURRENT_AFFILIATION = "Carnegie Mellon University, Machine Learning Department"
+TIMEOUT = (10, 30)
 
 
 def _to_str(val) -> str:
@@ -18,7 +19,7 @@ def _to_str(val) -> str:
 
 
 def get_data():
-    r = requests.get(INDEX_URL, headers={"User-Agent": "Mozilla/5.0"})
+    r = requests.get(INDEX_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
     r.raise_for_status()
     data = json.loads(r.text)
     students = data.get("data", [])
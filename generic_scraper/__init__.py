@@ -1,3 +1,37 @@
-from .schema import Record
-from .engine import run_targets, write_csv
-from .extractors import get_extractor, EXTRACTOR_REGISTRY
+import importlib
+
+# Public names resolve on first access, so `import generic_scraper` stays cheap and
+# requests/bs4/yaml load only once something actually runs a target
+_EXPORTS = {
+    "Record": ".schema",
+    "RecordBatch": ".schema",
+    "RunContext": ".context",
+    "iter_records": ".engine",
+    "run_batches": ".engine",
+    "run_targets": ".engine",
+    "run_to_sink": ".engine",
+    "stream_csv": ".engine",
+    "write_batches": ".engine",
+    "write_csv": ".engine",
+    "get_extractor": ".extractors",
+    "register_extractor": ".extractors",
+    "EXTRACTOR_REGISTRY": ".extractors",
+    "get_sink": ".sinks",
+    "open_sink": ".sinks",
+    "SINK_REGISTRY": ".sinks",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+TARGET_DIR = Path(__file__).parent.parent / "targets"
+
+# target id -> (config file, fixture for the configured URL, fixture for any other URL)
+TARGET_FIXTURES = {
+    "oxford": ("oxford.yaml", "oxford_members.html", "oxford_member.html"),
+    "iitm": ("iitm.yaml", "iitm_faculty.html", None),
+    "quotes": ("example_quotes.yaml", "quotes.html", None),
+}
+
+
+def load_fixture(name: str) -> bytes:
+    return (FIXTURE_DIR / name).read_bytes()
+
+
+def fixture_response(url: str, body: bytes, content_type: str = "text/html; charset=utf-8") -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.url = url
+    resp.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    resp._content = body
+    return resp
+
+
+def offline_fetch(first: bytes, other: bytes | None):
+    # The first URL an extractor asks for is its listing/index; everything after is a detail page
+    seen: list[str] = []
+
+    def fetch(url: str, max_bytes: int | None = None) -> requests.Response:
+        body = first if not seen or other is None else other
+        seen.append(url)
+        return fixture_response(url, body)
+
+    return fetch
@@ -0,0 +1,90 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Dependencies that should only load once a target needs them
+HEAVY = ["requests", "bs4", "soupsieve", "yaml", "lxml", "html5lib", "pyarrow", "zstandard", "sklearn"]
+
+# module -> heavy dependencies it is allowed to pull in
+MODULES = {
+    "generic_scraper": [],
+    "generic_scraper.schema": [],
+    "generic_scraper.sinks": [],
+    "generic_scraper.extractors": [],
+    "generic_scraper.engine": ["requests"],
+    "generic_scraper.run": ["requests"],
+    "generic_scraper.extractors.json_api": ["requests"],
+    # bs4 registers its lxml/html5lib tree builders on import when they are installed
+    "generic_scraper.extractors.css_select": ["requests", "bs4", "soupsieve", "lxml", "html5lib"],
+    "generic_scraper.extractors.html_attrs": ["requests", "bs4", "soupsieve", "lxml", "html5lib"],
+    "generic_scraper.extractors.html_listing": ["requests", "bs4", "soupsieve", "lxml", "html5lib"],
+}
+
+_PROBE = "import importlib, json, sys; importlib.import_module({mod!r}); print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))"
+
+
+def _project_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def import_ms(module: str) -> float:
+    # -X importtime reports cumulative microseconds per module on stderr; the last line is the requested one
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, cwd=_project_root(),
+    )
+    for line in reversed(out.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+def heavy_imports(module: str) -> list[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(mod=module, heavy=HEAVY)],
+        capture_output=True, text=True, check=True, cwd=_project_root(),
+    )
+    return json.loads(out.stdout)
+
+
+def run(modules: list[str], repeat: int) -> list[dict]:
+    rows = []
+    for module in modules:
+        times = [import_ms(module) for _ in range(repeat)]
+        loaded = heavy_imports(module)
+        unexpected = [m for m in loaded if m not in MODULES.get(module, HEAVY)]
+        rows.append({"module": module, "median_ms": statistics.median(times), "min_ms": min(times),
+                     "heavy": loaded, "unexpected": unexpected})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time per module and which heavy dependencies each pulls in")
+    parser.add_argument("--modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module; median is reported")
+    parser.add_argument("--max-ms", type=float, help="Fail if `import generic_scraper` takes longer than this")
+    parser.add_argument("-o", "--output", type=Path, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    rows = run(args.modules, args.repeat)
+    print(f"{'module':<42}{'median ms':>10}{'min ms':>9}  heavy deps")
+    for r in rows:
+        flag = f"  UNEXPECTED: {', '.join(r['unexpected'])}" if r["unexpected"] else ""
+        print(f"{r['module']:<42}{r['median_ms']:>10.1f}{r['min_ms']:>9.1f}  {', '.join(r['heavy']) or '-'}{flag}")
+    if args.output:
+        args.output.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+    failed = any(r["unexpected"] for r in rows)
+    top = next((r for r in rows if r["module"] == "generic_scraper"), None)
+    if args.max_ms is not None and top is not None and top["median_ms"] > args.max_ms:
+        print(f"import generic_scraper took {top['median_ms']:.1f} ms (budget {args.max_ms:.1f} ms)")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
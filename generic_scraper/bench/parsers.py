@@ -0,0 +1,57 @@
+import argparse
+import statistics
+import time
+
+import yaml
+from bs4.builder import builder_registry
+
+from ..extractors import get_extractor
+from ..parsers import PARSERS
+from .fixtures import TARGET_DIR, TARGET_FIXTURES, load_fixture, offline_fetch
+
+
+def bench_target(target: str, parser: str, repeat: int) -> tuple[float, float, int]:
+    cfg_name, first, other = TARGET_FIXTURES[target]
+    cfg = yaml.safe_load((TARGET_DIR / cfg_name).read_text(encoding="utf-8"))
+    cfg["parser"] = parser
+    cfg.get("detail", {}).pop("concurrency", None)
+    # One fixture stands in for every page, so paging would only re-time the same document
+    cfg.pop("pagination", None)
+    first_body = load_fixture(first)
+    other_body = load_fixture(other) if other else None
+
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        extractor = get_extractor(cfg["source_type"])(cfg)
+        extractor.fetch = offline_fetch(first_body, other_body)
+        start = time.perf_counter()
+        records = extractor.extract()
+        timings.append(time.perf_counter() - start)
+        # Extractors swallow per-page errors, so a stub that no longer fits self.fetch would only show up as empty records
+        empty = sum(1 for r in records if not r.raw)
+        if empty:
+            raise RuntimeError(f"{target}/{parser}: {empty} of {len(records)} records came back empty")
+        count = len(records)
+    return statistics.median(timings), min(timings), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse+extract time per HTML parser backend on saved fixtures")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--targets", nargs="*", default=list(TARGET_FIXTURES))
+    args = parser.parse_args()
+
+    backends = [p for p in PARSERS if builder_registry.lookup(PARSERS[p]) is not None]
+    missing = [p for p in PARSERS if p not in backends]
+    print(f"{'target':<10}{'parser':<14}{'records':>8}{'median ms':>12}{'min ms':>10}")
+    for target in args.targets:
+        for backend in backends:
+            median, best, count = bench_target(target, backend, args.repeat)
+            print(f"{target:<10}{backend:<14}{count:>8}{median * 1000:>12.1f}{best * 1000:>10.1f}")
+    if missing:
+        print(f"not installed: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
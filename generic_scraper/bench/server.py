@@ -0,0 +1,90 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .fixtures import load_fixture
+
+_REPEAT = re.compile(rb"<!-- repeat -->\n(.*?)<!-- /repeat -->\n", re.S)
+_MEMBER_LINK = re.compile(rb"(\./members/[\w-]+)/")
+
+
+def scale_html(body: bytes, scale: int, unique_links: bool = False) -> bytes:
+    m = _REPEAT.search(body)
+    if not m:
+        return body
+    block = m.group(1)
+    parts = [block]
+    for k in range(1, scale):
+        parts.append(_MEMBER_LINK.sub(rb"\1-%d/" % k, block) if unique_links else block)
+    return body[: m.start()] + b"".join(parts) + body[m.end() :]
+
+
+def scale_json(body: bytes, scale: int) -> bytes:
+    data = json.loads(body)
+    items = data.get("data", [])
+    data["data"] = [dict(item, id=f"{item.get('id')}-{k}") if k else item for k in range(scale) for item in items]
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def _route(path: str) -> tuple[str, bytes] | None:
+    # html_listing resolves detail links against the listing host, dropping the scale prefix
+    if path.startswith("/members/"):
+        return "text/html; charset=utf-8", load_fixture("oxford_member.html")
+    m = re.match(r"^/(\d+)/(.+)$", path)
+    if not m:
+        return None
+    scale, rest = int(m.group(1)), m.group(2)
+    if rest == "cmu_index.json":
+        return "application/json", scale_json(load_fixture("cmu_index.json"), scale)
+    if rest == "iitm_faculty.html":
+        return "text/html; charset=utf-8", scale_html(load_fixture("iitm_faculty.html"), scale)
+    if rest == "quotes.html":
+        return "text/html; charset=utf-8", scale_html(load_fixture("quotes.html"), scale)
+    if rest == "members.html":
+        return "text/html; charset=utf-8", scale_html(load_fixture("oxford_members.html"), scale, unique_links=True)
+    if rest.startswith("members/"):
+        return "text/html; charset=utf-8", load_fixture("oxford_member.html")
+    return None
+
+
+class FixtureServer:
+    def __init__(self):
+        cache: dict[str, tuple[str, bytes] | None] = {}
+        lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    if self.path not in cache:
+                        cache[self.path] = _route(self.path)
+                    hit = cache[self.path]
+                if hit is None:
+                    self.send_error(404)
+                    return
+                content_type, body = hit
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
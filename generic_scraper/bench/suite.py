@@ -0,0 +1,153 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import yaml
+
+from ..context import RunContext
+from ..engine import iter_records
+from ..trace import Tracer
+from .fixtures import TARGET_DIR
+from .server import FixtureServer
+
+# target id -> (config file, fixture path served under /{scale}/)
+TARGETS = {
+    "cmu": ("cmu.yaml", "cmu_index.json"),
+    "iitm": ("iitm.yaml", "iitm_faculty.html"),
+    "oxford": ("oxford.yaml", "members.html"),
+    "quotes": ("example_quotes.yaml", "quotes.html"),
+}
+DEFAULT_SCALES = [1, 10, 100]
+
+
+def local_config(target: str, root: str) -> dict:
+    cfg_name, fixture = TARGETS[target]
+    cfg = yaml.safe_load((TARGET_DIR / cfg_name).read_text(encoding="utf-8"))
+    cfg["base_url"] = root
+    # Each fixture is a single recorded page; pagination would point back at the live site
+    cfg.pop("pagination", None)
+    source_type = cfg.get("source_type")
+    if source_type == "json_api":
+        cfg["api"]["url"] = f"{root}/{fixture}"
+    elif source_type == "html_listing":
+        cfg["listing"]["url"] = f"{root}/{fixture}"
+    else:
+        cfg["url"] = f"{root}/{fixture}"
+    return cfg
+
+
+def run_case(cfg_path: Path, measure_memory: bool) -> dict:
+    tracer = Tracer()
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        first = None
+        records = 0
+        # The fixture server is local: politeness limits would only measure the configured rate
+        for _ in iter_records([cfg_path], context=RunContext(tracer=tracer, scheduler=None)):
+            if first is None:
+                first = time.perf_counter() - start
+            records += 1
+        wall = time.perf_counter() - start
+    finally:
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else 0
+        if measure_memory:
+            tracemalloc.stop()
+    stages = tracer.stage_totals()
+    return {
+        "records": records,
+        "wall_s": wall,
+        "first_record_s": first or 0.0,
+        "fetch_s": stages.get("fetch", 0.0),
+        "parse_s": stages.get("parse", 0.0) + stages.get("encoding", 0.0),
+        "extract_s": sum(stages.get(s, 0.0) for s in ("decode", "extract", "transform")),
+        "requests": tracer.summary()["requests"],
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def run_suite(targets: list[str], scales: list[int], repeat: int, memory: bool) -> list[dict]:
+    results = []
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as tmp:
+        for target in targets:
+            for scale in scales:
+                cfg = local_config(target, f"{server.base_url}/{scale}")
+                cfg_path = Path(tmp) / f"{target}_{scale}.yaml"
+                cfg_path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+                runs = [run_case(cfg_path, measure_memory=False) for _ in range(repeat)]
+                best = min(runs, key=lambda r: r["wall_s"])
+                # Stage times are summed across threads, so with concurrent fetches they can exceed wall time
+                row = {
+                    "target": target,
+                    "source_type": cfg.get("source_type"),
+                    "scale": scale,
+                    **best,
+                    "records_per_s": best["records"] / best["wall_s"] if best["wall_s"] else 0.0,
+                }
+                if memory:
+                    row["peak_mb"] = run_case(cfg_path, measure_memory=True)["peak_mb"]
+                else:
+                    row.pop("peak_mb")
+                results.append(row)
+                _print_row(row)
+    return results
+
+
+def _print_row(row: dict) -> None:
+    peak = f"{row['peak_mb']:>9.1f}" if "peak_mb" in row else f"{'-':>9}"
+    print(
+        f"{row['target']:<8}{row['scale']:>6}{row['records']:>9}{row['requests']:>7}"
+        f"{row['wall_s']:>9.2f}{row['fetch_s']:>9.2f}{row['parse_s']:>9.2f}{row['extract_s']:>9.2f}"
+        f"{row['first_record_s']:>9.2f}{row['records_per_s']:>11.1f}{peak}",
+        flush=True,
+    )
+
+
+def compare(old: list[dict], new: list[dict]) -> None:
+    before = {(r["target"], r["scale"]): r for r in old}
+    print(f"\n{'target':<8}{'scale':>6}{'old rec/s':>12}{'new rec/s':>12}{'speedup':>9}")
+    for r in new:
+        o = before.get((r["target"], r["scale"]))
+        if not o or not o["records_per_s"]:
+            continue
+        ratio = r["records_per_s"] / o["records_per_s"]
+        print(f"{r['target']:<8}{r['scale']:>6}{o['records_per_s']:>12.1f}{r['records_per_s']:>12.1f}{ratio:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of every extractor type against recorded fixtures")
+    parser.add_argument("--targets", nargs="*", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--scales", nargs="*", type=int, default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case; the fastest is reported")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass for peak memory")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare records/sec against")
+    args = parser.parse_args()
+
+    print(
+        f"{'target':<8}{'scale':>6}{'records':>9}{'reqs':>7}{'wall s':>9}{'fetch s':>9}"
+        f"{'parse s':>9}{'extr s':>9}{'first s':>9}{'rec/s':>11}{'peak MB':>9}"
+    )
+    results = run_suite(args.targets, args.scales, args.repeat, memory=not args.no_memory)
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results -> {args.output}")
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf-8"))["results"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Bodies are stored decoded, so transport headers no longer describe them
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status: int
+    headers: dict[str, str]
+    stored_at: float
+    body: bytes = field(repr=False, default=b"")
+
+    def validators(self) -> dict[str, str]:
+        out = {}
+        etag = self.headers.get("ETag") or self.headers.get("etag")
+        modified = self.headers.get("Last-Modified") or self.headers.get("last-modified")
+        if etag:
+            out["If-None-Match"] = etag
+        if modified:
+            out["If-Modified-Since"] = modified
+        return out
+
+    def to_response(self) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp.reason = "OK"
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp._content = self.body
+        resp.from_cache = True
+        return resp
+
+
+class ResponseCache:
+    def __init__(self, root: Path, ttl: float = 0.0, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size: int | None = None
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        d = self.root / key[:2]
+        return d / f"{key}.json", d / f"{key}.body"
+
+    def load(self, url: str) -> CacheEntry | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        # Eviction goes by body mtime, so every use counts as recent, not just stores and 304s
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return CacheEntry(
+            url=url,
+            status=int(meta.get("status", 200)),
+            headers=meta.get("headers", {}),
+            stored_at=float(meta.get("stored_at", 0)),
+            body=body,
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self.ttl > 0 and time.time() - entry.stored_at < self.ttl
+
+    def store(self, url: str, resp: requests.Response) -> None:
+        headers = {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS}
+        meta = {"url": url, "status": resp.status_code, "headers": headers, "stored_at": time.time()}
+        body = resp.content
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            size = self._current_size()
+            old = _file_size(body_path) + _file_size(meta_path)
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+            new = _file_size(body_path) + _file_size(meta_path)
+            self._size = size + new - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def refresh(self, entry: CacheEntry) -> None:
+        # A 304 restarts the freshness window without rewriting the body
+        entry.stored_at = time.time()
+        meta_path, body_path = self._paths(entry.url)
+        meta = {"url": entry.url, "status": entry.status, "headers": entry.headers, "stored_at": entry.stored_at}
+        with self._lock:
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+            try:
+                os.utime(body_path)
+            except OSError:
+                pass
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            self._size = sum(_file_size(p) for p in self.root.rglob("*") if p.is_file())
+        return self._size
+
+    def _evict(self) -> None:
+        bodies = sorted(self.root.rglob("*.body"), key=lambda p: _mtime(p))
+        target = int(self.max_bytes * 0.9)
+        for body_path in bodies:
+            if self._size <= target:
+                break
+            meta_path = body_path.with_suffix(".json")
+            freed = _file_size(body_path) + _file_size(meta_path)
+            for p in (body_path, meta_path):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            self._size -= freed
+
+
+def _file_size(p: Path) -> int:
+    try:
+        return p.stat().st_size
+    except OSError:
+        return 0
+
+
+def _mtime(p: Path) -> float:
+    try:
+        return p.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _atomic_write(p: Path, data: bytes) -> None:
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, p)
@@ -0,0 +1,51 @@
+import json
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+from .schema import Record
+
+
+class Checkpoint:
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.done: dict[str, Record] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._load()
+        self._lock = threading.Lock()
+        # Nothing to resume from an empty or completed journal, so start it afresh
+        self._fh = self.path.open("a" if self.done else "w", encoding="utf-8")
+
+    def _load(self) -> None:
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if entry.get("complete"):
+                        # The run that wrote this finished every page; a later --resume must fetch afresh
+                        self.done.clear()
+                        continue
+                    self.done[entry["id"]] = Record(**entry["record"])
+                except (ValueError, KeyError, TypeError):
+                    # A crash can leave a truncated last line
+                    continue
+
+    def get(self, item_id: str) -> Record | None:
+        return self.done.get(item_id)
+
+    def add(self, item_id: str, rec: Record) -> None:
+        line = json.dumps({"id": item_id, "record": asdict(rec)}, ensure_ascii=False)
+        with self._lock:
+            self.done[item_id] = rec
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def complete(self) -> None:
+        with self._lock:
+            self._fh.write(json.dumps({"complete": True}) + "\n")
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
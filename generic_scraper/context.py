@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import ResponseCache
+from .checkpoint import Checkpoint
+from .fingerprint import FingerprintStore
+from .scheduler import Scheduler
+from .trace import NullTracer
+
+
+@dataclass
+class RunContext:
+    cache: ResponseCache | None = None
+    state_dir: Path | None = None
+    resume: bool = False
+    skip_unchanged: bool = True
+    # Default per-target time budget in seconds; a target's http.deadline overrides it
+    deadline: float | None = None
+    tracer: NullTracer = field(default_factory=NullTracer)
+    # Shared by every target so limits hold per host, not per target
+    scheduler: Scheduler | None = field(default_factory=Scheduler)
+
+    def checkpoint(self, source_id: str) -> Checkpoint | None:
+        if self.state_dir is None:
+            return None
+        return Checkpoint(Path(self.state_dir) / f"{source_id}.checkpoint.jsonl", resume=self.resume)
+
+    def fingerprints(self, source_id: str) -> FingerprintStore | None:
+        if self.state_dir is None or not self.skip_unchanged:
+            return None
+        return FingerprintStore(Path(self.state_dir) / f"{source_id}.fingerprints.json")
@@ -0,0 +1,47 @@
+import codecs
+import re
+
+SNIFF_BYTES = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+# Matches both <meta charset="..."> and <meta http-equiv=... content="text/html; charset=...">
+_META_CHARSET = re.compile(rb"<meta[^>]*?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+
+def _known(name: str | bytes | None) -> str | None:
+    if not name:
+        return None
+    if isinstance(name, bytes):
+        name = name.decode("ascii", "ignore")
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def resolve_encoding(content_type: str | None, body: bytes) -> str:
+    # WHATWG sniffing order: a BOM overrides the header, which overrides <meta>
+    for bom, enc in _BOMS:
+        if body.startswith(bom):
+            return enc
+    if content_type:
+        m = _HEADER_CHARSET.search(content_type)
+        enc = _known(m.group(1)) if m else None
+        if enc:
+            return enc
+    head = body[:SNIFF_BYTES]
+    m = _META_CHARSET.search(head)
+    enc = _known(m.group(1)) if m else None
+    if enc:
+        return enc
+    # Last resort: only look at the prefix, tolerating a multi-byte char cut at the boundary
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=len(body) <= SNIFF_BYTES)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "windows-1252"
@@ -1,35 +1,187 @@
-import csv
+import json
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
-from .schema import Record, collect_all_columns
+from .context import RunContext
+from .schema import CORE_COLUMNS, Record, RecordBatch, to_batches
 from .extractors import get_extractor
+from .sinks import BaseSink, CsvSink, open_sink
 
 
-def run_targets(config_paths: list[Path]) -> list[Record]:
-    records: list[Record] = []
+# Records a target may run ahead of the writer before its extractor blocks
+QUEUE_SIZE = 1024
+# Most records handed to the sink per write
+CHUNK_SIZE = 512
+
+_DONE = object()
+
+
+def iter_records(config_paths: list[Path], jobs: int = 1, context: RunContext | None = None) -> Iterator[Record]:
+    for chunk in _iter_chunks(_load_targets(config_paths), jobs, context or RunContext()):
+        yield from chunk
+
+
+def run_targets(config_paths: list[Path], jobs: int = 1, context: RunContext | None = None) -> list[Record]:
+    return list(iter_records(config_paths, jobs, context))
+
+
+def run_batches(config_paths: list[Path], jobs: int = 1, context: RunContext | None = None) -> list[RecordBatch]:
+    return to_batches(iter_records(config_paths, jobs, context))
+
+
+def stream_csv(config_paths: list[Path], out_path: Path, jobs: int = 1, context: RunContext | None = None) -> int:
+    return run_to_sink(config_paths, CsvSink(out_path, stream=True), jobs=jobs, context=context)
+
+
+def run_to_sink(config_paths: list[Path], sink: BaseSink, jobs: int = 1, context: RunContext | None = None) -> int:
+    context = context or RunContext()
+    targets = _load_targets(config_paths)
+    sink.open(declared_columns([cfg for _, cfg in targets]))
+    try:
+        for chunk in _iter_chunks(targets, jobs, context):
+            with context.tracer.span("write"):
+                for batch in to_batches(chunk):
+                    sink.write(batch)
+    finally:
+        with context.tracer.span("write"):
+            sink.close()
+    return sink.count
+
+
+def write_records(records: Iterable[Record], sink: BaseSink, columns: list[str] | None = None) -> int:
+    # For record streams that went through a post-processing stage instead of straight from the targets
+    records = iter(records)
+    sink.open(columns)
+    try:
+        for chunk in iter(lambda: list(islice(records, CHUNK_SIZE)), []):
+            for batch in to_batches(chunk):
+                sink.write(batch)
+    finally:
+        sink.close()
+    return sink.count
+
+
+def declared_columns(configs: list[dict]) -> list[str] | None:
+    seen: set[str] = set()
+    for cfg in configs:
+        try:
+            keys = get_extractor(cfg.get("source_type", "")).raw_keys(cfg)
+        except ValueError:
+            continue
+        if keys is None:
+            return None
+        source = str(cfg.get("id", "unknown"))
+        seen.update(f"{source}_{k}" for k in keys)
+    return CORE_COLUMNS + sorted(seen)
+
+
+def _load_targets(config_paths: list[Path]) -> list[tuple[Path, dict]]:
+    targets = []
     for path in config_paths:
         cfg = _load_config(path)
-        if not cfg:
+        if cfg:
+            targets.append((path, cfg))
+    return targets
+
+
+def _iter_chunks(targets: list[tuple[Path, dict]], jobs: int, context: RunContext) -> Iterator[list[Record]]:
+    # Each target extracts on its own thread into a bounded queue; the caller drains the queues
+    # in config order, so output is deterministic and a target that runs ahead blocks instead of buffering
+    if not targets:
+        return
+    jobs = max(1, min(jobs, len(targets)))
+    queues = [queue.Queue(QUEUE_SIZE) for _ in targets]
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_produce, path, cfg, context, q, stop) for (path, cfg), q in zip(targets, queues)]
+        try:
+            for q in queues:
+                done = False
+                while not done:
+                    chunk = [q.get()]
+                    while len(chunk) < CHUNK_SIZE and chunk[-1] is not _DONE:
+                        try:
+                            chunk.append(q.get_nowait())
+                        except queue.Empty:
+                            break
+                    if chunk[-1] is _DONE:
+                        chunk.pop()
+                        done = True
+                    if chunk:
+                        yield chunk
+        finally:
+            stop.set()
+            for f in futures:
+                f.cancel()
+
+
+def _produce(path: Path, cfg: dict, context: RunContext, q: queue.Queue, stop: threading.Event) -> None:
+    try:
+        with closing(_iter_target(path, cfg, context)) as records:
+            for rec in records:
+                if not _put(q, rec, stop):
+                    return
+    finally:
+        _put(q, _DONE, stop)
+
+
+def _put(q: queue.Queue, item: object, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
             continue
+    return False
+
+
+def _iter_target(path: Path, cfg: dict, context: RunContext) -> Iterator[Record]:
+    # A failing target is reported and ends early; records it already produced are kept
+    try:
         source_type = cfg.get("source_type", "")
         extractor_cls = get_extractor(source_type)
-        extractor = extractor_cls(cfg)
-        records.extend(extractor.extract())
-    return records
+        extractor = extractor_cls(cfg, context)
+        try:
+            with context.tracer.span("target", "target", target=extractor.source_id):
+                yield from extractor.iter_extract()
+        finally:
+            extractor.close()
+    except Exception as e:
+        print(f"Target {path} failed: {e!r}", file=sys.stderr)
 
 
 def write_csv(records: list[Record], out_path: Path) -> None:
-    columns = collect_all_columns(records)
-    rows = [r.to_flat_dict(columns) for r in records]
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(rows)
+    write_batches(to_batches(records), out_path)
+
+
+def write_batches(batches: list[RecordBatch], out_path: Path, fmt: str | None = None) -> None:
+    with open_sink(out_path, fmt) as sink:
+        sink.open(None)
+        for batch in batches:
+            sink.write(batch)
 
 
 def _load_config(path: Path) -> dict | None:
     try:
-        import yaml
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        text = path.read_text(encoding="utf-8")
+        if path.suffix.lower() == ".json":
+            return json.loads(text) or {}
+        return _yaml_loader()(text) or {}
     except Exception:
         return None
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader() -> Callable[[str], Any]:
+    # Resolved once per process; libyaml's C loader parses several times faster when available
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return lambda text: yaml.load(text, Loader=loader)
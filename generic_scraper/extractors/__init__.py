@@ -1,19 +1,116 @@
-from .base import BaseExtractor
-from .html_listing import HtmlListingExtractor
-from .json_api import JsonApiExtractor
-from .html_attrs import HtmlAttrsExtractor
-from .css_select import CssSelectExtractor
-
-EXTRACTOR_REGISTRY = {
-    "html_listing": HtmlListingExtractor,
-    "json_api": JsonApiExtractor,
-    "html_attrs": HtmlAttrsExtractor,
-    "css_select": CssSelectExtractor,
+import importlib
+import threading
+from typing import TYPE_CHECKING, Iterator, MutableMapping
+
+if TYPE_CHECKING:
+    from .base import BaseExtractor
+
+# Third-party packages register extra source types under this entry-point group, e.g.
+# [project.entry-points."generic_scraper.extractors"] my_type = "my_pkg.extractor:MyExtractor"
+ENTRY_POINT_GROUP = "generic_scraper.extractors"
+
+_BUILTINS = {
+    "html_listing": "generic_scraper.extractors.html_listing:HtmlListingExtractor",
+    "json_api": "generic_scraper.extractors.json_api:JsonApiExtractor",
+    "html_attrs": "generic_scraper.extractors.html_attrs:HtmlAttrsExtractor",
+    "css_select": "generic_scraper.extractors.css_select:CssSelectExtractor",
 }
 
 
-def get_extractor(source_type: str) -> type[BaseExtractor]:
+def _load(target: str) -> type:
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+class ExtractorRegistry(MutableMapping[str, "type[BaseExtractor]"]):
+    # Maps source_type -> extractor class, importing each module only when its type is first used
+    def __init__(self, builtins: dict[str, str]):
+        self._targets: dict[str, object] = dict(builtins)
+        self._classes: dict[str, type] = {}
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        with self._lock:
+            if self._discovered:
+                return
+            from importlib.metadata import entry_points
+
+            for ep in entry_points(group=ENTRY_POINT_GROUP):
+                # Built-ins and explicit registrations win over plugins with the same name
+                self._targets.setdefault(ep.name.strip().lower(), ep)
+            self._discovered = True
+
+    def register(self, name: str, extractor: "type[BaseExtractor] | str") -> None:
+        key = name.strip().lower()
+        with self._lock:
+            self._targets[key] = extractor
+            self._classes.pop(key, None)
+
+    def __getitem__(self, name: str) -> "type[BaseExtractor]":
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+        if name not in self._targets:
+            self._discover()
+        target = self._targets[name]
+        if isinstance(target, str):
+            cls = _load(target)
+        elif isinstance(target, type):
+            cls = target
+        else:
+            cls = target.load()
+        self._classes[name] = cls
+        return cls
+
+    def __setitem__(self, name: str, extractor: "type[BaseExtractor] | str") -> None:
+        self.register(name, extractor)
+
+    def __delitem__(self, name: str) -> None:
+        key = name.strip().lower()
+        with self._lock:
+            del self._targets[key]
+            self._classes.pop(key, None)
+
+    def __contains__(self, name: object) -> bool:
+        if name not in self._targets:
+            self._discover()
+        return name in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._targets))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._targets)
+
+
+EXTRACTOR_REGISTRY = ExtractorRegistry(_BUILTINS)
+
+
+def register_extractor(name: str, extractor: "type[BaseExtractor] | str") -> None:
+    EXTRACTOR_REGISTRY.register(name, extractor)
+
+
+def get_extractor(source_type: str) -> "type[BaseExtractor]":
     t = source_type.strip().lower()
     if t not in EXTRACTOR_REGISTRY:
         raise ValueError(f"Unknown source_type: {source_type}. Known: {list(EXTRACTOR_REGISTRY)}")
     return EXTRACTOR_REGISTRY[t]
+
+
+# Class names the package exported before the registry went lazy
+_CLASSES = {target.rpartition(":")[2]: target for target in _BUILTINS.values()}
+
+
+def __getattr__(name: str):
+    if name == "BaseExtractor":
+        from .base import BaseExtractor
+
+        return BaseExtractor
+    if name in _CLASSES:
+        return _load(_CLASSES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,74 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator
 
+import requests
+
+from ..context import RunContext
+from ..encoding import resolve_encoding
+from ..fetch import Fetcher
+from ..parsers import parse_html, resolve_parser
 from ..schema import Record
 
+if TYPE_CHECKING:
+    import bs4
+
 
 class BaseExtractor(ABC):
-    def __init__(self, config: dict[str, Any]):
+    def __init__(self, config: dict[str, Any], context: RunContext | None = None):
         self.config = config
+        self.context = context or RunContext()
         self.source_id = str(config.get("id", "unknown"))
         self.base_url = (config.get("base_url") or "").rstrip("/")
+        self.parser = resolve_parser(config.get("parser"))
+        self.fetcher = Fetcher(
+            config.get("http") or {},
+            cache=self.context.cache,
+            scheduler=self.context.scheduler,
+            deadline=self.context.deadline,
+        )
+
+    def span(self, name: str, cat: str = "stage", **args: Any):
+        return self.context.tracer.span(name, cat, target=self.source_id, **args)
+
+    def fetch(self, url: str, max_bytes: int | None = None) -> requests.Response:
+        tracer = self.context.tracer
+        start = time.perf_counter()
+        with self.span("fetch"):
+            resp = self.fetcher.get(url, max_bytes=max_bytes)
+        if tracer.enabled:
+            tracer.request(
+                url,
+                resp.status_code,
+                len(resp.content),
+                resp.elapsed.total_seconds(),
+                time.perf_counter() - start,
+                cached=getattr(resp, "from_cache", False),
+            )
+        return resp
+
+    def parse(self, content: bytes, encoding: str | None = None) -> "bs4.BeautifulSoup":
+        with self.span("parse"):
+            return parse_html(content, self.parser, encoding)
+
+    def parse_response(self, resp: requests.Response) -> "bs4.BeautifulSoup":
+        body = resp.content
+        with self.span("encoding"):
+            resp.encoding = resolve_encoding(resp.headers.get("Content-Type"), body)
+        return self.parse(body, resp.encoding)
+
+    def close(self) -> None:
+        self.fetcher.close()
+
+    @classmethod
+    def raw_keys(cls, config: dict[str, Any]) -> list[str] | None:
+        # Keys this config can put in Record.raw; None means unknown until records exist
+        return None
 
     @abstractmethod
-    def extract(self) -> list[Record]:
+    def iter_extract(self) -> Iterator[Record]:
+        # Records are yielded as pages are extracted so the engine can write them before the target finishes
         pass
+
+    def extract(self) -> list[Record]:
+        return list(self.iter_extract())
@@ -1,45 +1,52 @@
+from typing import Iterator
 from urllib.parse import urljoin
 
-import requests
 import bs4
 
+from ..context import RunContext
+from ..pagination import iter_pages
+from ..plan import compile_css_select
 from ..schema import Record
 from .base import BaseExtractor
 
 
 class CssSelectExtractor(BaseExtractor):
-    def extract(self) -> list[Record]:
-        url = self.config.get("url", "")
-        item_sel = self.config.get("item_selector", "")
-        field_sel = self.config.get("field_selectors", {})
-        field_attr = self.config.get("field_attributes", {})
-        link_fields = set(self.config.get("link_fields", []))
-        base = self.config.get("base_url") or self.base_url or ""
-
-        if not url or not item_sel:
-            return []
-
-        resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-        resp.raise_for_status()
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        soup = bs4.BeautifulSoup(resp.content, "html.parser")
+    def __init__(self, config: dict, context: RunContext | None = None):
+        super().__init__(config, context)
+        self.plan = compile_css_select(config, self.config.get("base_url") or self.base_url or "")
 
+    @classmethod
+    def raw_keys(cls, config: dict) -> list[str]:
+        return list(config.get("field_selectors", {}))
+
+    def iter_extract(self) -> Iterator[Record]:
+        plan = self.plan
+        if not (plan.url or plan.pages and plan.pages.template) or plan.items is None:
+            return
+        for page in iter_pages(self.fetch, plan.pages, plan.url, self.parse_response, self._extract_page):
+            yield from page
+
+    def _extract_page(self, soup: bs4.BeautifulSoup) -> list[Record]:
+        with self.span("extract"):
+            return self._records_from(soup)
+
+    def _records_from(self, soup: bs4.BeautifulSoup) -> list[Record]:
+        plan = self.plan
         records = []
-        for el in soup.select(item_sel):
+        for el in plan.items.select(soup):
             raw = {}
-            for out_key, sel in field_sel.items():
-                sub = el.select_one(sel) if sel else el
+            for f in plan.fields:
+                sub = f.selector.select_one(el) if f.selector is not None else el
                 if not sub:
-                    raw[out_key] = ""
+                    raw[f.key] = ""
                     continue
-                attr = field_attr.get(out_key)
-                if attr:
-                    val = sub.get(attr, "") or ""
-                    if out_key in link_fields and val and not str(val).startswith("http") and base:
-                        val = urljoin(base + "/", str(val))
+                if f.attr:
+                    val = sub.get(f.attr, "") or ""
+                    if f.link and val and not str(val).startswith("http") and plan.base:
+                        val = urljoin(plan.base + "/", str(val))
                 else:
                     val = sub.get_text(strip=True)
-                raw[out_key] = str(val).strip() if val else ""
+                raw[f.key] = str(val).strip() if val else ""
             name_val = str(raw.get("name", raw.get("title", ""))).strip()
             email_val = str(raw.get("email", "")).strip()
             url_val = str(raw.get("url", raw.get("profile_url", raw.get("link", "")))).strip()
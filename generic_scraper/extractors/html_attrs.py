@@ -1,42 +1,43 @@
-from urllib.parse import urljoin
+from typing import Iterator
 
-import requests
 import bs4
 
+from ..context import RunContext
+from ..plan import compile_html_attrs
 from ..schema import Record
 from .base import BaseExtractor
 
 
 class HtmlAttrsExtractor(BaseExtractor):
-    def extract(self) -> list[Record]:
-        url = self.config.get("url", "")
-        container = self.config.get("container_selector", "")
-        attr_map = self.config.get("attribute_map", {})
-        transforms = self.config.get("transforms", {})
-        base = self.config.get("base_url") or self.base_url or ""
+    def __init__(self, config: dict, context: RunContext | None = None):
+        super().__init__(config, context)
+        self.plan = compile_html_attrs(config, self.config.get("base_url") or self.base_url or "")
 
-        if not url or not container:
-            return []
+    @classmethod
+    def raw_keys(cls, config: dict) -> list[str]:
+        return list(config.get("attribute_map", {}))
 
-        resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    def iter_extract(self) -> Iterator[Record]:
+        plan = self.plan
+        if not plan.url or plan.container is None:
+            return
+
+        resp = self.fetch(plan.url)
         resp.raise_for_status()
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        soup = bs4.BeautifulSoup(resp.content, "html.parser")
+        soup = self.parse_response(resp)
+        with self.span("extract"):
+            records = self._records_from(soup)
+        yield from records
 
+    def _records_from(self, soup: bs4.BeautifulSoup) -> list[Record]:
         records = []
-        for el in soup.select(container):
+        for el in self.plan.container.select(soup):
             if not el:
                 continue
             raw = {}
-            for out_key, attr_name in attr_map.items():
-                val = el.get(attr_name, "") or ""
-                val = str(val).strip()
-                t = transforms.get(out_key, "")
-                if t == "deobfuscate_email":
-                    val = val.replace("[at]", "@").replace("[dot]", ".")
-                elif t == "absolute_url" and val and not val.startswith("http"):
-                    val = urljoin(base + "/", val)
-                raw[out_key] = val
+            for a in self.plan.attrs:
+                val = el.get(a.attr, "") or ""
+                raw[a.key] = a.transform(str(val).strip())
             name_val = str(raw.get("name", "")).strip()
             email_val = str(raw.get("email", "")).strip()
             url_val = str(raw.get("profile_url", raw.get("url", ""))).strip()
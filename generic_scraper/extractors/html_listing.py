@@ -1,157 +1,226 @@
-import re
-import requests
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator
 from urllib.parse import urljoin, urlparse
 
 import bs4
+import requests
 
+from ..checkpoint import Checkpoint
+from ..context import RunContext
+from ..fetch import DeadlineExceeded
+from ..fingerprint import FingerprintStore, fingerprint
+from ..parsers import page_text
+from ..plan import DetailRule, HtmlListingPlan, compile_html_listing
 from ..schema import Record
 from .base import BaseExtractor
 
 
 class HtmlListingExtractor(BaseExtractor):
-    def extract(self) -> list[Record]:
-        listing = self.config.get("listing", {})
-        detail_cfg = self.config.get("detail", {})
-
-        listing_url = listing.get("url", "")
-        if not listing_url:
-            return []
-
-        base = f"{urlparse(listing_url).scheme}://{urlparse(listing_url).netloc}"
-        resp = requests.get(listing_url, headers={"User-Agent": "Mozilla/5.0"})
-        resp.encoding = resp.apparent_encoding or "utf-8"
-        soup = bs4.BeautifulSoup(resp.content, "html.parser")
-
-        links = self._get_links(soup, listing, base, listing_url)
-        records = []
-        for item_id, item_url in links.items():
-            rec = self._scrape_detail(item_url, item_id, detail_cfg, base)
-            records.append(rec)
-        return records
-
-    def _get_links(self, soup: bs4.BeautifulSoup, listing: dict, base: str, listing_url: str) -> dict[str, str]:
-        sel = listing.get("link_selector", "a[href]")
-        link_attr = listing.get("link_attr", "href")
-        flt = listing.get("link_filter", {})
-        id_from_path = listing.get("id_from_path", -1)
-
+    def __init__(self, config: dict, context: RunContext | None = None):
+        super().__init__(config, context)
+        self.plan = compile_html_listing(config)
+        self.fingerprints: FingerprintStore | None = None
+
+    @classmethod
+    def raw_keys(cls, config: dict) -> list[str]:
+        rules = (config.get("detail") or {}).get("extract", [])
+        return ["member_id", "url"] + [r["field"] for r in rules if r.get("field")]
+
+    def iter_extract(self) -> Iterator[Record]:
+        plan = self.plan
+        if not plan.url:
+            return
+
+        resp = self.fetch(plan.url)
+        soup = self.parse_response(resp)
+        with self.span("extract"):
+            links = self._get_links(soup, plan)
+        checkpoint = self.context.checkpoint(self.source_id)
+        self.fingerprints = self.context.fingerprints(self.source_id)
+        try:
+            failed = 0
+            for rec in self._iter_scrape(links, checkpoint):
+                failed += not rec.raw
+                yield rec
+            # Only a run that got every page retires its journal; failed pages stay resumable
+            if checkpoint is not None and not failed:
+                checkpoint.complete()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            if self.fingerprints is not None:
+                self.fingerprints.close()
+                print(
+                    f"{self.source_id}: {self.fingerprints.skipped} detail pages unchanged, "
+                    f"{self.fingerprints.extracted} extracted",
+                    file=sys.stderr,
+                )
+
+    def _iter_scrape(self, links: dict[str, str], checkpoint: Checkpoint | None) -> Iterator[Record]:
+        def scrape_one(item_id: str, item_url: str) -> Record:
+            if checkpoint is not None:
+                done = checkpoint.get(item_id)
+                if done is not None:
+                    return done
+            rec = self._scrape_detail(item_url, item_id)
+            # Failed fetches come back with an empty raw; leave them for the next resume
+            if checkpoint is not None and rec.raw:
+                checkpoint.add(item_id, rec)
+            return rec
+
+        concurrency = self.plan.concurrency
+        if concurrency == 1 or len(links) < 2:
+            for item_id, item_url in links.items():
+                yield scrape_one(item_id, item_url)
+            return
+
+        hosts = {urlparse(u).netloc for u in links.values()}
+        slots = {h: threading.BoundedSemaphore(concurrency) for h in hosts}
+
+        def scrape(item_id: str, item_url: str) -> Record:
+            with slots[urlparse(item_url).netloc]:
+                return scrape_one(item_id, item_url)
+
+        workers = min(len(links), concurrency * len(hosts))
+        items = iter(links.items())
+        pending: deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                # Only a couple of rounds of pages run ahead of the consumer, and records keep listing order
+                for item in islice(items, workers * 2):
+                    pending.append(pool.submit(scrape, *item))
+                while pending:
+                    rec = pending.popleft().result()
+                    item = next(items, None)
+                    if item is not None:
+                        pending.append(pool.submit(scrape, *item))
+                    yield rec
+            finally:
+                for f in pending:
+                    f.cancel()
+
+    def _get_links(self, soup: bs4.BeautifulSoup, plan: HtmlListingPlan) -> dict[str, str]:
         items: dict[str, str] = {}
-        for a in soup.select(sel) if sel else soup.find_all("a"):
-            href = a.get(link_attr) or ""
+        for a in plan.links.select(soup) if plan.links is not None else soup.find_all("a"):
+            href = a.get(plan.link_attr) or ""
             href = str(href).strip()
             if not href:
                 continue
-            if flt.get("href_contains") and flt["href_contains"] not in href:
+            if plan.href_contains and plan.href_contains not in href:
                 continue
-            if "path_segments" in flt:
+            if plan.path_segments is not None:
                 parts = href.replace("\\", "/").split("/")
-                if len(parts) != flt["path_segments"]:
+                if len(parts) != plan.path_segments:
                     continue
-            full_url = urljoin(base + "/", href.lstrip("./"))
-            if id_from_path >= 0:
+            full_url = urljoin(plan.base + "/", href.lstrip("./"))
+            if plan.id_from_path >= 0:
                 parts = full_url.rstrip("/").split("/")
-                item_id = parts[id_from_path] if id_from_path < len(parts) else full_url
+                item_id = parts[plan.id_from_path] if plan.id_from_path < len(parts) else full_url
             else:
                 item_id = full_url
             items[item_id] = full_url
         return items
 
-    def _scrape_detail(self, url: str, item_id: str, detail_cfg: dict, base: str) -> Record:
+    def _scrape_detail(self, url: str, item_id: str) -> Record:
+        with self.span("page", cat="page", url=url):
+            return self._scrape_detail_page(url, item_id)
+
+    def _scrape_detail_page(self, url: str, item_id: str) -> Record:
+        try:
+            resp = self.fetch(url, max_bytes=self.plan.max_bytes)
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            return Record(source=self.source_id, name=item_id, url=url)
+
+        store = self.fingerprints
+        if store is None:
+            return self._extract_detail(resp, url, item_id)
+        with self.span("fingerprint"):
+            digest = fingerprint(resp.content, self.plan.fingerprint_ignore, self.plan.signature)
+            rec = store.get(url, digest)
+        if rec is None:
+            rec = self._extract_detail(resp, url, item_id)
+            store.put(url, digest, rec)
+        return rec
+
+    def _extract_detail(self, resp: requests.Response, url: str, item_id: str) -> Record:
         raw: dict = {}
         url_val = url
         name_val = item_id
         email_val = ""
 
         try:
-            resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            resp.encoding = resp.apparent_encoding or "utf-8"
-            soup = bs4.BeautifulSoup(resp.content, "html.parser")
+            soup = self.parse_response(resp)
         except Exception:
             return Record(source=self.source_id, name=name_val, url=url_val, email=email_val, raw=raw)
 
         raw["member_id"] = item_id
         raw["url"] = url
-        extract_rules = detail_cfg.get("extract", [])
-        for rule in extract_rules:
-            field = rule.get("field", "")
-            if not field:
-                continue
-            if rule.get("from_id"):
+        with self.span("extract"):
+            name_val, email_val = self._apply_rules(soup, raw, url, item_id, name_val, email_val)
+        with self.span("transform"):
+            for fname, transform in self.plan.transforms:
+                if fname in raw:
+                    raw[fname] = transform(raw[fname])
+                    if fname == "email" or fname == "mailto_raw":
+                        email_val = raw[fname] or email_val
+
+        return Record(source=self.source_id, name=name_val, url=url_val, email=email_val, raw=raw)
+
+    def _apply_rules(
+        self, soup: bs4.BeautifulSoup, raw: dict, url: str, item_id: str, name_val: str, email_val: str
+    ) -> tuple[str, str]:
+        for rule in self.plan.rules:
+            field = rule.field
+            if rule.kind == "from_id":
                 raw[field] = item_id
                 if field == "name":
                     name_val = item_id
                 continue
-            if rule.get("from_url"):
+            if rule.kind == "from_url":
                 raw[field] = url
                 continue
-            if rule.get("selector"):
-                val = self._extract_by_rule(soup, rule, base)
-                if field == "name":
-                    name_val = val or name_val
-                elif field == "email":
-                    email_val = val or email_val
-                raw[field] = val
-            elif rule.get("tag"):
+            if rule.kind == "selector":
+                val = self._extract_by_rule(soup, rule)
+            else:
                 val = self._extract_generic(soup, rule)
-                if field == "name":
-                    name_val = val or name_val
-                elif field == "email":
-                    email_val = val or email_val
-                raw[field] = val
-
-        transforms = detail_cfg.get("transforms", {})
-        for fname, tname in transforms.items():
-            if fname in raw and tname == "mailto_extract":
-                raw[fname] = self._mailto_extract(raw[fname])
-                if fname == "email" or fname == "mailto_raw":
-                    email_val = raw[fname] or email_val
-
-        return Record(source=self.source_id, name=name_val, url=url_val, email=email_val, raw=raw)
-
-    def _extract_by_rule(self, soup: bs4.BeautifulSoup, rule: dict, base: str) -> str:
-        sel = rule.get("selector", "")
-        attr = rule.get("attribute")
-        as_text = rule.get("text", False)
-        first_only = rule.get("first", True)
-        els = soup.select(sel) if sel else []
+            if field == "name":
+                name_val = val or name_val
+            elif field == "email":
+                email_val = val or email_val
+            raw[field] = val
+        return name_val, email_val
+
+    def _extract_by_rule(self, soup: bs4.BeautifulSoup, rule: DetailRule) -> str:
+        els = rule.selector.select(soup, limit=1 if rule.first else 0)
         if not els:
             return ""
-        if first_only and els:
-            els = [els[0]]
         vals = []
         for el in els:
-            if as_text:
+            if rule.as_text:
                 vals.append(el.get_text(strip=True))
-            elif attr:
-                v = el.get(attr) or ""
-                if attr == "href" and v and not str(v).startswith("http") and base:
-                    v = urljoin(base + "/", str(v))
+            elif rule.attr:
+                v = el.get(rule.attr) or ""
+                if rule.attr == "href" and v and not str(v).startswith("http") and self.plan.base:
+                    v = urljoin(self.plan.base + "/", str(v))
                 vals.append(str(v) if v else "")
             else:
                 vals.append(el.get_text(strip=True))
         return "; ".join(v for v in vals if v)
 
-    def _extract_generic(self, soup: bs4.BeautifulSoup, rule: dict) -> str:
-        tag = rule.get("tag", "")
-        if tag == "mailto":
-            links = soup.find_all("a", href=True)
-            for a in links:
+    def _extract_generic(self, soup: bs4.BeautifulSoup, rule: DetailRule) -> str:
+        if rule.tag == "mailto":
+            for a in soup.find_all("a", href=True):
                 h = a.get("href", "")
                 if "mailto:" in str(h):
                     return str(h).replace("mailto:", "").strip()
             return ""
-        if tag == "page_text":
-            stop = rule.get("stop_at") or []
-            text = soup.get_text(separator="\n", strip=True)
-            for marker in stop:
-                if marker in text:
-                    text = text.split(marker)[0]
-            return text[: rule.get("max_chars", 10000)]
+        if rule.tag == "page_text":
+            root = rule.root.select_one(soup) if rule.root is not None else None
+            return page_text(root if root is not None else soup, rule.stop_at, rule.max_chars)
         return ""
-
-    def _mailto_extract(self, val: str) -> str:
-        if not val:
-            return ""
-        if isinstance(val, str) and "mailto:" in val:
-            return val.replace("mailto:", "").strip()
-        return str(val)
@@ -1,29 +1,44 @@
-import json
-import requests
+from typing import Any, Iterator
 from urllib.parse import urljoin
 
+import requests
+
+from ..context import RunContext
+from ..pagination import get_nested, iter_pages
+from ..plan import compile_json_api
 from ..schema import Record
 from .base import BaseExtractor
 
 
 class JsonApiExtractor(BaseExtractor):
-    def extract(self) -> list[Record]:
-        api = self.config.get("api", {})
-        url = api.get("url", "")
-        data_path = api.get("data_path", "data")
-        mapping = self.config.get("field_mapping", {})
-        name_field = self.config.get("name_field", "")
-        url_field = self.config.get("url_field", "")
-        transforms = self.config.get("transforms", {})
-
-        if not url:
-            return []
-
-        resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-        resp.raise_for_status()
-        data = resp.json()
-
-        for seg in data_path.split("."):
+    def __init__(self, config: dict, context: RunContext | None = None):
+        super().__init__(config, context)
+        self.plan = compile_json_api(config, self.base_url)
+
+    @classmethod
+    def raw_keys(cls, config: dict) -> list[str]:
+        return list(config.get("field_mapping", {}))
+
+    def iter_extract(self) -> Iterator[Record]:
+        plan = self.plan
+        if not (plan.url or plan.pages and plan.pages.template):
+            return
+        for page in iter_pages(self.fetch, plan.pages, plan.url, self._decode, self._extract_page):
+            yield from page
+
+    def _decode(self, resp: requests.Response) -> Any:
+        if getattr(resp, "truncated", False):
+            raise ValueError(f"{resp.url} is larger than http.max_bytes")
+        with self.span("decode"):
+            return resp.json()
+
+    def _extract_page(self, data: Any) -> list[Record]:
+        with self.span("extract"):
+            return self._records_from(data)
+
+    def _records_from(self, data: Any) -> list[Record]:
+        plan = self.plan
+        for seg in plan.data_path:
             data = data.get(seg, [])
         if not isinstance(data, list):
             data = [data]
@@ -33,37 +48,16 @@ class JsonApiExtractor(BaseExtractor):
             if not isinstance(item, dict):
                 continue
             raw = {}
-            for out_key, json_key in mapping.items():
-                val = self._get_nested(item, json_key)
-                t = transforms.get(out_key, "raw")
-                val = self._apply_transform(val, t)
-                raw[out_key] = val
-            name_val = raw.get(name_field or (list(mapping.keys())[0] if mapping else ""), "")
+            for f in plan.fields:
+                raw[f.key] = f.transform(get_nested(item, f.path))
+            name_val = raw.get(plan.name_field, "")
             if isinstance(name_val, list):
                 name_val = " ".join(str(x) for x in name_val if x)
             name_val = str(name_val).strip()
             url_val = ""
-            if url_field and url_field in raw:
-                p = raw[url_field]
+            if plan.url_field and plan.url_field in raw:
+                p = raw[plan.url_field]
                 url_val = urljoin(self.base_url + "/", str(p)) if p else ""
             email_val = str(raw.get("email", "")).strip()
             records.append(Record(source=self.source_id, name=name_val, url=url_val, email=email_val, raw=raw))
         return records
-
-    def _get_nested(self, d: dict, path: str):
-        for k in path.split("."):
-            d = d.get(k) if isinstance(d, dict) else None
-        return d
-
-    def _apply_transform(self, val, t: str):
-        if t == "raw":
-            return val
-        if t == "list_join":
-            if isinstance(val, list):
-                return "; ".join(str(x).strip() for x in val if x)
-            return str(val) if val else ""
-        if t == "andrew_email":
-            if val:
-                return f"{val}@andrew.cmu.edu"
-            return ""
-        return val
@@ -0,0 +1,238 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterator
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+from urllib3.util.retry import Retry
+
+from .cache import ResponseCache
+from .scheduler import HostBusy, HostLimits, HostState, Scheduler
+
+DEFAULT_USER_AGENT = "Mozilla/5.0"
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+
+
+class DeadlineExceeded(requests.Timeout):
+    host_fault = False
+
+
+def _accept_encoding() -> str:
+    # urllib3 only decodes brotli when one of these packages is importable
+    for mod in ("brotli", "brotlicffi"):
+        try:
+            __import__(mod)
+            return "gzip, deflate, br"
+        except ImportError:
+            continue
+    return "gzip, deflate"
+
+
+def _iter_body(resp: requests.Response) -> Iterator[bytes]:
+    # read1 returns whatever arrived instead of blocking for a full chunk, so a trickling
+    # server still reaches the deadline check between reads
+    raw = resp.raw
+    if not hasattr(raw, "read1"):
+        yield from resp.iter_content(CHUNK_BYTES)
+        return
+    try:
+        while True:
+            chunk = raw.read1(CHUNK_BYTES, decode_content=True)
+            if not chunk:
+                return
+            yield chunk
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e) from e
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+    except SSLError as e:
+        raise requests.exceptions.SSLError(e) from e
+
+
+class Fetcher:
+    def __init__(
+        self,
+        http_cfg: dict[str, Any] | None = None,
+        cache: ResponseCache | None = None,
+        scheduler: Scheduler | None = None,
+        deadline: float | None = None,
+    ):
+        cfg = http_cfg or {}
+        self.connect_timeout = float(cfg.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT))
+        self.read_timeout = float(cfg.get("read_timeout", DEFAULT_READ_TIMEOUT))
+        self.max_bytes = int(cfg.get("max_bytes", DEFAULT_MAX_BYTES) or 0)
+        # Total wall-clock budget for everything this fetcher downloads (one target)
+        budget = cfg.get("deadline", deadline)
+        self.deadline = time.monotonic() + float(budget) if budget else None
+        self.cache = cache if cfg.get("cache", True) else None
+        self.scheduler = scheduler
+        self.limits = HostLimits.from_config(cfg)
+        self.headers = {
+            "User-Agent": cfg.get("user_agent", DEFAULT_USER_AGENT),
+            "Accept-Encoding": _accept_encoding(),
+        }
+        self.headers.update(cfg.get("headers") or {})
+        self.pool_connections = int(cfg.get("pool_connections", 4))
+        self.pool_maxsize = int(cfg.get("pool_maxsize", 10))
+        self.retry = Retry(
+            total=int(cfg.get("retries", 3)),
+            backoff_factor=float(cfg.get("backoff_factor", 0.5)),
+            status_forcelist=tuple(cfg.get("retry_statuses", DEFAULT_RETRY_STATUSES)),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._sessions: dict[str, requests.Session] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            sess = self._sessions.get(key)
+            if sess is None:
+                sess = requests.Session()
+                sess.headers.update(self.headers)
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=self.retry,
+                )
+                sess.mount("http://", adapter)
+                sess.mount("https://", adapter)
+                self._sessions[key] = sess
+        return sess
+
+    def _send(self, url: str, max_bytes: int, **kwargs: Any) -> requests.Response:
+        if self.scheduler is None:
+            return self._download(url, max_bytes, **kwargs)
+        host = self.scheduler.host(url, self.limits, self.headers["User-Agent"])
+        delay = host.hedge_delay()
+        if delay is None:
+            return self._attempt(host, url, max_bytes, **kwargs)
+        # Hedge: if the request outlives the host's usual latency, race a duplicate and keep the first good answer.
+        # The clock starts once the first attempt holds its slot, so time spent queued behind the rate limit
+        # or the concurrency cap never counts as a slow response
+        pool = self._hedge_pool()
+        on_wire = threading.Event()
+        first = pool.submit(self._attempt, host, url, max_bytes, on_wire=on_wire, **kwargs)
+        on_wire.wait()
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        try:
+            # Never queues: a throttled host or one at its concurrency limit is not sent a duplicate
+            second = pool.submit(self._attempt, host, url, max_bytes, block=False, **kwargs)
+        except RuntimeError:
+            return first.result()
+        pending = {first, second}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if second in done and isinstance(second.exception(), HostBusy):
+                return first.result()
+            ok = [f for f in done if f.exception() is None]
+            if ok or not pending:
+                winner = (ok or list(done))[0]
+                host.hedged(won=winner is second)
+                return winner.result()
+
+    def _attempt(
+        self,
+        host: HostState,
+        url: str,
+        max_bytes: int,
+        on_wire: threading.Event | None = None,
+        block: bool = True,
+        **kwargs: Any,
+    ) -> requests.Response:
+        try:
+            with host.slot(block) as slot:
+                if on_wire is not None:
+                    on_wire.set()
+                resp = self._download(url, max_bytes, **kwargs)
+                slot.observe(resp)
+        finally:
+            # Also released when the slot was never granted (open breaker, deadline), so the caller stops waiting
+            if on_wire is not None:
+                on_wire.set()
+        return resp
+
+    def _hedge_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.pool_maxsize * 2, thread_name_prefix="hedge")
+            return self._pool
+
+    def _remaining(self, url: str) -> float | None:
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"target deadline exceeded before {url}")
+        return remaining
+
+    def _download(self, url: str, max_bytes: int, **kwargs: Any) -> requests.Response:
+        remaining = self._remaining(url)
+        read = self.read_timeout if remaining is None else min(self.read_timeout, remaining)
+        connect = self.connect_timeout if remaining is None else min(self.connect_timeout, remaining)
+        kwargs.setdefault("timeout", (connect, read))
+        resp = self.session(url).get(url, stream=True, **kwargs)
+        # Read the body ourselves so an oversized page stops at max_bytes and a slow one at the deadline
+        chunks: list[bytes] = []
+        size = 0
+        resp.truncated = False
+        try:
+            for chunk in _iter_body(resp):
+                if self.deadline is not None and time.monotonic() > self.deadline:
+                    raise DeadlineExceeded(f"target deadline exceeded while reading {url}")
+                if max_bytes and size + len(chunk) > max_bytes:
+                    chunks.append(chunk[: max_bytes - size])
+                    resp.truncated = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        finally:
+            resp.close()
+        resp._content = b"".join(chunks)
+        resp._content_consumed = True
+        return resp
+
+    def get(self, url: str, max_bytes: int | None = None, **kwargs: Any) -> requests.Response:
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        if self.cache is None:
+            return self._send(url, max_bytes, **kwargs)
+        entry = self.cache.load(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.to_response()
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            headers.update(entry.validators())
+        resp = self._send(url, max_bytes, headers=headers, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.refresh(entry)
+            return entry.to_response()
+        if resp.status_code == 200 and not resp.truncated:
+            self.cache.store(url, resp)
+        return resp
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            # A losing hedge may still be downloading; let it finish on its own
+            pool.shutdown(wait=False, cancel_futures=True)
+        for sess in sessions:
+            sess.close()
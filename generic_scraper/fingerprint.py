@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+from .schema import Record
+
+_WS = re.compile(rb"\s+")
+
+
+def fingerprint(body: bytes, ignore: tuple[re.Pattern, ...] = (), salt: str = "") -> str:
+    # Whitespace-only reflows and ignored fragments (tokens, timestamps) don't count as changes
+    for pattern in ignore:
+        body = pattern.sub(b"", body)
+    body = _WS.sub(b" ", body).strip()
+    h = hashlib.sha256(salt.encode("utf-8"))
+    h.update(body)
+    return h.hexdigest()
+
+
+class FingerprintStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._old: dict[str, dict] = {}
+        self._new: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.extracted = 0
+        try:
+            self._old = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    def get(self, url: str, digest: str) -> Record | None:
+        entry = self._old.get(url)
+        if entry is None or entry.get("hash") != digest:
+            return None
+        try:
+            rec = Record(**entry["record"])
+        except (KeyError, TypeError):
+            return None
+        with self._lock:
+            self._new[url] = entry
+            self.skipped += 1
+        return rec
+
+    def put(self, url: str, digest: str, rec: Record) -> None:
+        with self._lock:
+            self.extracted += 1
+            if rec.raw:
+                self._new[url] = {"hash": digest, "record": asdict(rec)}
+
+    def close(self) -> None:
+        # Pages this run never reached (resumed, past the deadline, failed fetch) keep their previous entry
+        with self._lock:
+            data = json.dumps({**self._old, **self._new}, ensure_ascii=False)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.path)
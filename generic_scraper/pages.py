@@ -0,0 +1,54 @@
+from typing import TYPE_CHECKING, Callable
+
+from .encoding import resolve_encoding
+from .fetch import Fetcher
+from .parsers import parse_html
+
+if TYPE_CHECKING:
+    import bs4
+
+
+class Page:
+    def __init__(self, url: str, soup: "bs4.BeautifulSoup"):
+        self.url = url
+        self.soup = soup
+        self._text: dict[str, str] = {}
+        self._hrefs: list[str] | None = None
+
+    def text(self, separator: str) -> str:
+        if separator not in self._text:
+            self._text[separator] = self.soup.get_text(separator=separator, strip=True)
+        return self._text[separator]
+
+    @property
+    def hrefs(self) -> list[str]:
+        if self._hrefs is None:
+            self._hrefs = [str(a.attrs.get("href")) for a in self.soup.find_all("a") if a.attrs.get("href")]
+        return self._hrefs
+
+
+ANALYZERS: dict[str, Callable[[Page], str]] = {}
+
+
+def analyzer(name: str):
+    def register(fn: Callable[[Page], str]) -> Callable[[Page], str]:
+        ANALYZERS[name] = fn
+        return fn
+
+    return register
+
+
+# Uncached, so a script run always sees the live page; sessions are reused across calls
+_FETCHER = Fetcher()
+
+
+def fetch_page(url: str, fetcher: Fetcher | None = None) -> Page:
+    resp = (fetcher or _FETCHER).get(url)
+    body = resp.content
+    resp.encoding = resolve_encoding(resp.headers.get("Content-Type"), body)
+    return Page(url, parse_html(body, encoding=resp.encoding))
+
+
+def analyze(url: str, names: list[str] | None = None, fetcher: Fetcher | None = None) -> dict[str, str]:
+    page = fetch_page(url, fetcher)
+    return {name: fn(page) for name, fn in ANALYZERS.items() if names is None or name in names}
@@ -0,0 +1,118 @@
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterator
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+import requests
+
+from .plan import PaginationPlan
+from .schema import Record
+
+# Past the first page, these mean the template ran off the end of the listing
+END_STATUSES = {404, 410}
+# Upper bound for a url_template without max_pages, in case a site never returns an empty page
+DEFAULT_MAX_PAGES = 1000
+
+Fetch = Callable[[str], requests.Response]
+Load = Callable[[requests.Response], Any]
+Extract = Callable[[Any], list[Record]]
+
+
+def iter_pages(
+    fetch: Fetch, plan: PaginationPlan | None, url: str, load: Load, extract: Extract
+) -> Iterator[list[Record]]:
+    if plan is None:
+        resp = fetch(url)
+        resp.raise_for_status()
+        yield extract(load(resp))
+    elif plan.template:
+        yield from _iter_template(fetch, plan, load, extract)
+    else:
+        yield from _iter_linked(fetch, plan, url, load, extract)
+
+
+def _iter_template(fetch: Fetch, plan: PaginationPlan, load: Load, extract: Extract) -> Iterator[list[Record]]:
+    # Page URLs are known up front: keep a window of downloads in flight and consume them in order
+    limit = plan.max_pages or DEFAULT_MAX_PAGES
+    urls = (plan.page_url(i) for i in range(limit))
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=plan.window) as pool:
+        try:
+            for u in islice(urls, plan.window):
+                pending.append(pool.submit(fetch, u))
+            previous: list[Record] | None = None
+            pages = 0
+            while pending:
+                resp = pending.popleft().result()
+                if previous is not None and resp.status_code in END_STATUSES:
+                    break
+                resp.raise_for_status()
+                records = extract(load(resp))
+                # Sites that clamp out-of-range page numbers keep serving the last page
+                if not records or records == previous:
+                    break
+                previous = records
+                pages += 1
+                nxt = next(urls, None)
+                if nxt is not None:
+                    pending.append(pool.submit(fetch, nxt))
+                yield records
+            if pages == limit and not plan.max_pages:
+                print(f"pagination stopped at {limit} pages; set pagination.max_pages to go further", file=sys.stderr)
+        finally:
+            for f in pending:
+                f.cancel()
+
+
+def _iter_linked(fetch: Fetch, plan: PaginationPlan, url: str, load: Load, extract: Extract) -> Iterator[list[Record]]:
+    # Each page names the next one: start its download before extracting the current page
+    seen = {url}
+    pages = 0
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future: Future | None = pool.submit(fetch, url)
+        try:
+            while future is not None:
+                resp = future.result()
+                resp.raise_for_status()
+                doc = load(resp)
+                pages += 1
+                future = None
+                if not plan.max_pages or pages < plan.max_pages:
+                    nxt = next_url(plan, doc, url)
+                    if nxt and nxt not in seen:
+                        seen.add(nxt)
+                        url = nxt
+                        future = pool.submit(fetch, nxt)
+                yield extract(doc)
+        finally:
+            if future is not None:
+                future.cancel()
+
+
+def next_url(plan: PaginationPlan, doc: Any, url: str) -> str | None:
+    if plan.next_selector is not None:
+        el = plan.next_selector.select_one(doc)
+        href = el.get(plan.next_attr) if el is not None else None
+        return urljoin(url, str(href)) if href else None
+    if plan.next_path:
+        href = get_nested(doc, plan.next_path)
+        return urljoin(url, str(href)) if href else None
+    if plan.cursor_path:
+        cursor = get_nested(doc, plan.cursor_path)
+        return with_query(url, plan.cursor_param, str(cursor)) if cursor not in (None, "") else None
+    return None
+
+
+def with_query(url: str, key: str, value: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != key]
+    query.append((key, value))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_nested(d: Any, path: tuple[str, ...]) -> Any:
+    for k in path:
+        d = d.get(k) if isinstance(d, dict) else None
+    return d
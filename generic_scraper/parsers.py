@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import bs4
+
+DEFAULT_PARSER = "html.parser"
+
+# Backends share the bs4 tree API, so selector rules behave the same on each
+PARSERS = {
+    "html.parser": "html.parser",
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+}
+
+
+def resolve_parser(name: str | None) -> str:
+    key = (name or DEFAULT_PARSER).strip().lower()
+    if key not in PARSERS:
+        raise ValueError(f"Unknown parser: {name}. Known: {list(PARSERS)}")
+    if key == DEFAULT_PARSER:
+        # Stdlib-backed, so JSON-only runs never have to import bs4 to validate it
+        return PARSERS[key]
+    from bs4.builder import builder_registry
+
+    if builder_registry.lookup(PARSERS[key]) is None:
+        raise ValueError(f"Parser {key!r} is not installed (pip install {key})")
+    return PARSERS[key]
+
+
+def parse_html(content: bytes | str, parser: str = DEFAULT_PARSER, encoding: str | None = None) -> "bs4.BeautifulSoup":
+    import bs4
+
+    if isinstance(content, str):
+        return bs4.BeautifulSoup(content, resolve_parser(parser))
+    # A known encoding keeps bs4 from running its own charset detection over the document
+    return bs4.BeautifulSoup(content, resolve_parser(parser), from_encoding=encoding)
+
+
+def page_text(root: "bs4.Tag", stop_at: tuple[str, ...] = (), max_chars: int = 10000, separator: str = "\n") -> str:
+    # Same strings get_text(separator, strip=True) would join, pulled lazily so the walk ends as soon as
+    # the earliest stop marker or max_chars is settled instead of flattening the whole document
+    longest = max((len(m) for m in stop_at), default=0)
+    overlap = max(longest - 1, 0)
+    limit = max_chars + overlap
+    parts: list[str] = []
+    size = 0
+    carry = ""
+    stop: int | None = None
+    for s in root.stripped_strings:
+        piece = separator + s if parts else s
+        if stop_at and stop is None:
+            # Markers may straddle the previous piece, so search from its last few characters
+            window = carry + piece
+            hits = [i for i in (window.find(m) for m in stop_at) if i >= 0]
+            if hits:
+                stop = size - len(carry) + min(hits)
+            carry = window[-overlap:] if overlap else ""
+        parts.append(piece)
+        size += len(piece)
+        # An earlier marker could still be completing until `overlap` characters past the hit
+        if size >= limit or (stop is not None and size >= stop + overlap):
+            break
+    text = "".join(parts)
+    cuts = [i for i in (text.find(m) for m in stop_at) if i >= 0]
+    if cuts:
+        text = text[: min(cuts)]
+    return text[:max_chars]
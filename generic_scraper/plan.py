@@ -0,0 +1,252 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from .parsers import DEFAULT_PARSER
+from .transforms import Transform, resolve_transform
+
+if TYPE_CHECKING:
+    from soupsieve import SoupSieve
+
+
+def compile_selector(sel: str | None) -> "SoupSieve | None":
+    if not sel:
+        return None
+    # Imported here so JSON-only targets skip the selector engine
+    import soupsieve
+
+    return soupsieve.compile(sel)
+
+
+@dataclass(frozen=True, slots=True)
+class PaginationPlan:
+    template: str
+    start: int
+    page_size: int
+    next_selector: "SoupSieve | None"
+    next_attr: str
+    next_path: tuple[str, ...]
+    cursor_path: tuple[str, ...]
+    cursor_param: str
+    max_pages: int
+    window: int
+
+    def page_url(self, index: int) -> str:
+        return self.template.format(page=self.start + index, offset=index * self.page_size)
+
+
+def compile_pagination(config: dict[str, Any]) -> PaginationPlan | None:
+    pages = config.get("pagination")
+    if not pages:
+        return None
+    return PaginationPlan(
+        template=pages.get("url_template", ""),
+        start=int(pages.get("start", 1)),
+        page_size=int(pages.get("page_size", 0) or 0),
+        next_selector=compile_selector(pages.get("next_selector")),
+        next_attr=pages.get("next_attr", "href"),
+        next_path=_path(pages.get("next_field")),
+        cursor_path=_path(pages.get("cursor_field")),
+        cursor_param=pages.get("cursor_param", "cursor"),
+        max_pages=int(pages.get("max_pages", 0) or 0),
+        window=max(1, int(pages.get("window", 4) or 1)),
+    )
+
+
+def _path(dotted: str | None) -> tuple[str, ...]:
+    return tuple(str(dotted).split(".")) if dotted else ()
+
+
+@dataclass(frozen=True, slots=True)
+class FieldPlan:
+    key: str
+    selector: "SoupSieve | None"
+    attr: str | None
+    link: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CssSelectPlan:
+    url: str
+    items: "SoupSieve | None"
+    fields: tuple[FieldPlan, ...]
+    base: str
+    pages: PaginationPlan | None
+
+
+def compile_css_select(config: dict[str, Any], base: str) -> CssSelectPlan:
+    field_attr = config.get("field_attributes", {})
+    link_fields = set(config.get("link_fields", []))
+    fields = tuple(
+        FieldPlan(key=key, selector=compile_selector(sel), attr=field_attr.get(key), link=key in link_fields)
+        for key, sel in config.get("field_selectors", {}).items()
+    )
+    return CssSelectPlan(
+        url=config.get("url", ""),
+        items=compile_selector(config.get("item_selector", "")),
+        fields=fields,
+        base=base,
+        pages=compile_pagination(config),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class AttrPlan:
+    key: str
+    attr: str
+    transform: Transform
+
+
+@dataclass(frozen=True, slots=True)
+class HtmlAttrsPlan:
+    url: str
+    container: "SoupSieve | None"
+    attrs: tuple[AttrPlan, ...]
+
+
+def compile_html_attrs(config: dict[str, Any], base: str) -> HtmlAttrsPlan:
+    transforms = config.get("transforms", {})
+    attrs = tuple(
+        AttrPlan(key=key, attr=attr, transform=resolve_transform(transforms.get(key), base))
+        for key, attr in config.get("attribute_map", {}).items()
+    )
+    return HtmlAttrsPlan(
+        url=config.get("url", ""),
+        container=compile_selector(config.get("container_selector", "")),
+        attrs=attrs,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class JsonFieldPlan:
+    key: str
+    path: tuple[str, ...]
+    transform: Transform
+
+
+@dataclass(frozen=True, slots=True)
+class JsonApiPlan:
+    url: str
+    data_path: tuple[str, ...]
+    fields: tuple[JsonFieldPlan, ...]
+    name_field: str
+    url_field: str
+    pages: PaginationPlan | None
+
+
+def compile_json_api(config: dict[str, Any], base: str) -> JsonApiPlan:
+    api = config.get("api", {})
+    mapping = config.get("field_mapping", {})
+    transforms = config.get("transforms", {})
+    fields = tuple(
+        JsonFieldPlan(key=key, path=tuple(str(path).split(".")), transform=resolve_transform(transforms.get(key), base))
+        for key, path in mapping.items()
+    )
+    return JsonApiPlan(
+        url=api.get("url", ""),
+        data_path=tuple(api.get("data_path", "data").split(".")),
+        fields=fields,
+        name_field=config.get("name_field", "") or (next(iter(mapping)) if mapping else ""),
+        url_field=config.get("url_field", ""),
+        pages=compile_pagination(config),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class DetailRule:
+    field: str
+    kind: str
+    selector: "SoupSieve | None" = None
+    attr: str | None = None
+    as_text: bool = False
+    first: bool = True
+    tag: str = ""
+    stop_at: tuple[str, ...] = ()
+    max_chars: int = 10000
+    root: "SoupSieve | None" = None
+
+
+@dataclass(frozen=True, slots=True)
+class HtmlListingPlan:
+    url: str
+    base: str
+    links: "SoupSieve | None"
+    link_attr: str
+    href_contains: str
+    path_segments: int | None
+    id_from_path: int
+    rules: tuple[DetailRule, ...]
+    transforms: tuple[tuple[str, Transform], ...]
+    concurrency: int
+    fingerprint_ignore: tuple[re.Pattern, ...]
+    signature: str
+    max_bytes: int | None
+
+
+def _compile_rule(rule: dict[str, Any]) -> DetailRule | None:
+    field = rule.get("field", "")
+    if not field:
+        return None
+    if rule.get("from_id"):
+        return DetailRule(field=field, kind="from_id")
+    if rule.get("from_url"):
+        return DetailRule(field=field, kind="from_url")
+    if rule.get("selector"):
+        return DetailRule(
+            field=field,
+            kind="selector",
+            selector=compile_selector(rule["selector"]),
+            attr=rule.get("attribute"),
+            as_text=bool(rule.get("text", False)),
+            first=bool(rule.get("first", True)),
+        )
+    if rule.get("tag"):
+        return DetailRule(
+            field=field,
+            kind="tag",
+            tag=rule["tag"],
+            stop_at=tuple(rule.get("stop_at") or ()),
+            max_chars=int(rule.get("max_chars", 10000)),
+            root=compile_selector(rule.get("root")),
+        )
+    return None
+
+
+def _listing_signature(config: dict[str, Any]) -> str:
+    # Anything that shapes a stored record invalidates the target's fingerprints: the detail rules,
+    # the parser backend and the listing settings that pick item ids
+    listing = config.get("listing", {})
+    payload = {
+        "detail": config.get("detail", {}),
+        "parser": (config.get("parser") or DEFAULT_PARSER).strip().lower(),
+        "listing": {k: listing.get(k) for k in ("link_selector", "link_attr", "link_filter", "id_from_path")},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def compile_html_listing(config: dict[str, Any]) -> HtmlListingPlan:
+    listing = config.get("listing", {})
+    detail = config.get("detail", {})
+    url = listing.get("url", "")
+    base = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
+    flt = listing.get("link_filter", {})
+    rules = tuple(r for r in (_compile_rule(rule) for rule in detail.get("extract", [])) if r is not None)
+    transforms = tuple((field, resolve_transform(name, base)) for field, name in detail.get("transforms", {}).items())
+    return HtmlListingPlan(
+        url=url,
+        base=base,
+        links=compile_selector(listing.get("link_selector", "a[href]")),
+        link_attr=listing.get("link_attr", "href"),
+        href_contains=flt.get("href_contains", ""),
+        path_segments=flt.get("path_segments"),
+        id_from_path=listing.get("id_from_path", -1),
+        rules=rules,
+        transforms=transforms,
+        concurrency=max(1, int(detail.get("concurrency", 1) or 1)),
+        fingerprint_ignore=tuple(re.compile(p.encode("utf-8")) for p in detail.get("fingerprint_ignore", [])),
+        signature=_listing_signature(config),
+        max_bytes=int(detail["max_bytes"]) if detail.get("max_bytes") is not None else None,
+    )
@@ -1,10 +1,17 @@
 import argparse
 from pathlib import Path
 
-from .engine import run_targets, write_csv
+from .cache import ResponseCache
+from .context import RunContext
+from .engine import iter_records, run_to_sink, write_records
+from .scheduler import Scheduler
+from .sinks import SINK_REGISTRY, open_sink
+from .trace import Tracer
 
 DEFAULT_TARGETS = Path(__file__).parent / "targets"
 DEFAULT_OUTPUT = Path(__file__).parent.parent / "generic_master.csv"
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".scraper_cache"
+DEFAULT_STATE_DIR = Path(__file__).parent.parent / ".scraper_state"
 
 
 def main():
@@ -24,7 +31,93 @@ def main():
         "--output",
         type=Path,
         default=DEFAULT_OUTPUT,
-        help=f"Output CSV path (default: {DEFAULT_OUTPUT})",
+        help=f"Output path; the format follows the extension (default: {DEFAULT_OUTPUT})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(SINK_REGISTRY),
+        help="Output format, overriding the extension (.csv, .jsonl[.gz|.zst], .parquet, .arrow)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of targets to run in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"HTTP response cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the HTTP response cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0.0,
+        help="Seconds a cached response is reused without revalidation (default: 0, always revalidate)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Evict least recently used cache entries above this size (default: 512)",
+    )
+    parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=DEFAULT_STATE_DIR,
+        help=f"Directory for per-target checkpoint journals (default: {DEFAULT_STATE_DIR})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse detail pages already recorded in the checkpoint journals",
+    )
+    parser.add_argument(
+        "--reextract",
+        action="store_true",
+        help="Re-extract every detail page even if its content fingerprint is unchanged",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write CSV rows as each target finishes instead of buffering the whole run (JSONL always streams)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help="Seconds each target may spend downloading before it is stopped (http.deadline overrides)",
+    )
+    parser.add_argument(
+        "--no-throttle",
+        action="store_true",
+        help="Drop per-host rate limits, robots.txt Crawl-delay and adaptive concurrency (breakers and hedging stay on)",
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Run the regex text analyzers (affiliations, research interests) in a process pool as records arrive",
+    )
+    parser.add_argument(
+        "--analyze-workers",
+        type=int,
+        help="Worker processes for --analyze (default: CPU count; 0 runs in-process)",
+    )
+    parser.add_argument(
+        "--topics",
+        action="store_true",
+        help="Add corpus-level TF-IDF research_topics to every record before writing (needs scikit-learn; buffers the run)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        help="Write per-target/page/stage timings and request stats as a trace-event JSON file",
     )
     args = parser.parse_args()
 
@@ -33,9 +126,59 @@ def main():
     else:
         configs = [Path(p) for p in args.configs]
 
-    records = run_targets(configs)
-    write_csv(records, args.output)
-    print(f"Scraped {len(records)} records -> {args.output}")
+    context = RunContext(
+        state_dir=args.state_dir,
+        resume=args.resume,
+        skip_unchanged=not args.reextract,
+        deadline=args.deadline,
+    )
+    if args.profile:
+        context.tracer = Tracer()
+    if args.no_throttle:
+        context.scheduler = Scheduler(throttle=False)
+    if not args.no_cache:
+        context.cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+    sink = open_sink(args.output, args.format, stream=args.stream)
+    if not args.analyze and not args.topics:
+        count = run_to_sink(configs, sink, jobs=args.jobs, context=context)
+    else:
+        records = iter_records(configs, jobs=args.jobs, context=context)
+        if args.analyze:
+            from .stages.text import iter_analyzed
+
+            records = iter_analyzed(records, workers=args.analyze_workers)
+        if args.topics:
+            # IDF needs the whole corpus, so this collects every record before writing
+            from .stages.topics import add_research_topics
+
+            records = add_research_topics(records)
+        count = write_records(records, sink)
+    print(f"Scraped {count} records -> {args.output}")
+    if args.profile:
+        hosts = context.scheduler.stats() if context.scheduler is not None else {}
+        context.tracer.write(args.profile, hosts=hosts)
+        _print_profile({**context.tracer.summary(), "hosts": hosts}, args.profile)
+
+
+def _print_profile(summary: dict, path: Path) -> None:
+    print(f"Profile -> {path}")
+    print(f"  {summary['requests']} requests ({summary['cached_requests']} cached), {summary['bytes'] / 1024:.0f} KiB")
+    for stage, secs in sorted(summary["stages_s"].items(), key=lambda kv: -kv[1]):
+        print(f"  {stage:<12}{secs:>9.2f}s")
+    for r in summary["slowest_urls"][:5]:
+        print(f"  {r['total_s']:>8.2f}s  {r['url']}")
+    for host, h in summary["hosts"].items():
+        p50 = f"{h['p50_s']:.2f}s" if h["p50_s"] is not None else "-"
+        p95 = f"{h['p95_s']:.2f}s" if h["p95_s"] is not None else "-"
+        print(
+            f"  {host}: {h['requests']} requests, {h['errors']} errors, p50 {p50}, p95 {p95}, "
+            f"{h['hedges']} hedged ({h['hedge_wins']} won), breaker {h['breaker']} ({h['fast_failed']} fast-failed)"
+        )
+        print(
+            f"    concurrency {h['concurrency']:g}, {h['throttled']} throttled, "
+            f"{h['waited_s']:.2f}s queued, crawl-delay {h['crawl_delay']:g}s"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,370 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterator
+from urllib.parse import urlparse
+
+import requests
+
+# Responses that mean the host wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+
+class CircuitOpen(requests.ConnectionError):
+    pass
+
+
+class HostBusy(Exception):
+    # A non-blocking slot() found no free token or concurrency slot
+    pass
+
+
+@dataclass(frozen=True)
+class HostLimits:
+    rate: float = 0.0  # requests/sec, 0 = no token bucket
+    burst: int = 1
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    robots: bool = True
+    latency_factor: float = 3.0
+    breaker_failures: int = 5  # consecutive failures that open the breaker, 0 = never
+    breaker_cooldown: float = 30.0
+    hedge_percentile: float = 95.0  # 0 = never hedge
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def from_config(cls, http_cfg: dict[str, Any] | None) -> "HostLimits":
+        http_cfg = http_cfg or {}
+        cfg = http_cfg.get("rate_limit") or {}
+        breaker = http_cfg.get("breaker") or {}
+        hedge = http_cfg.get("hedge", {})
+        if hedge is None or hedge is True:
+            hedge = {}
+        elif hedge is False:
+            hedge = {"percentile": 0}
+        return cls(
+            rate=float(cfg.get("rate", 0) or 0),
+            burst=max(1, int(cfg.get("burst", 1) or 1)),
+            min_concurrency=max(1, int(cfg.get("min_concurrency", 1) or 1)),
+            max_concurrency=max(1, int(cfg.get("max_concurrency", 16) or 1)),
+            robots=bool(cfg.get("robots", True)),
+            latency_factor=float(cfg.get("latency_factor", 3.0) or 3.0),
+            breaker_failures=int(breaker.get("failures", 5) or 0),
+            breaker_cooldown=float(breaker.get("cooldown", 30.0)),
+            hedge_percentile=float(hedge.get("percentile", 95.0) or 0),
+            hedge_min_samples=max(1, int(hedge.get("min_samples", 20) or 1)),
+        )
+
+    def merge(self, other: "HostLimits") -> "HostLimits":
+        # Targets sharing a host get the stricter of their settings
+        rates = [r for r in (self.rate, other.rate) if r > 0]
+        return HostLimits(
+            rate=min(rates) if rates else 0.0,
+            burst=min(self.burst, other.burst),
+            min_concurrency=min(self.min_concurrency, other.min_concurrency),
+            max_concurrency=min(self.max_concurrency, other.max_concurrency),
+            robots=self.robots or other.robots,
+            latency_factor=min(self.latency_factor, other.latency_factor),
+            breaker_failures=min(self.breaker_failures, other.breaker_failures),
+            breaker_cooldown=max(self.breaker_cooldown, other.breaker_cooldown),
+            hedge_percentile=max(self.hedge_percentile, other.hedge_percentile)
+            if self.hedge_percentile and other.hedge_percentile
+            else 0.0,
+            hedge_min_samples=max(self.hedge_min_samples, other.hedge_min_samples),
+        )
+
+
+class HostState:
+    def __init__(self, host: str, limits: HostLimits, throttle: bool = True):
+        self.host = host
+        self.limits = limits
+        self.throttle = throttle
+        self.crawl_delay = 0.0
+        self.limit = float(limits.max_concurrency)
+        self.in_flight = 0
+        self.tokens = float(limits.burst)
+        self.blocked_until = 0.0
+        self.latency: float | None = None
+        self.best_latency: float | None = None
+        self.requests = 0
+        self.throttled = 0
+        self.waited_s = 0.0
+        self.errors = 0
+        self.fast_failed = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.samples: deque[float] = deque(maxlen=256)
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._refilled = time.monotonic()
+        self._last_cut = 0.0
+        self._cond = threading.Condition()
+        self._robots_checked = False
+
+    def configure(self, limits: HostLimits) -> None:
+        with self._cond:
+            if limits != self.limits:
+                self.limits = self.limits.merge(limits)
+                self.limit = min(self.limit, self.limits.max_concurrency)
+                self.tokens = min(self.tokens, self.limits.burst)
+
+    def rate(self) -> float:
+        rates = [r for r in (self.limits.rate, 1.0 / self.crawl_delay if self.crawl_delay else 0.0) if r > 0]
+        return min(rates) if rates else 0.0
+
+    def allow(self) -> None:
+        # Closed until breaker_failures in a row; then fail fast for the cooldown and let one probe through
+        with self._cond:
+            if not self.limits.breaker_failures or self._failures < self.limits.breaker_failures:
+                return
+            if time.monotonic() < self._open_until or self._probing:
+                self.fast_failed += 1
+                raise CircuitOpen(f"circuit open for {self.host} after {self._failures} consecutive failures")
+            self._probing = True
+
+    def acquire(self, block: bool = True) -> None:
+        start = time.monotonic()
+        with self._cond:
+            while self.throttle:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    break
+                if not block:
+                    raise HostBusy(self.host)
+                self._cond.wait(None if math.isinf(wait) else wait)
+            if self.throttle and self.rate() > 0:
+                self.tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            self.waited_s += time.monotonic() - start
+
+    def _wait_time(self, now: float) -> float:
+        if self.in_flight >= int(self.limit):
+            return math.inf
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        rate = self.rate()
+        if rate <= 0:
+            return 0.0
+        burst = 1 if self.crawl_delay else self.limits.burst
+        self.tokens = min(burst, self.tokens + (now - self._refilled) * rate)
+        self._refilled = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / rate
+
+    def release(self, status: int | None, latency: float, retry_after: float = 0.0, retried: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            self._probing = False
+            if status == 0:
+                # Aborted on our side (deadline): neither a failure nor a latency sample
+                self._cond.notify_all()
+                return
+            if status is None or status >= 500:
+                self.errors += 1
+                self._failures += 1
+                if self.limits.breaker_failures and self._failures >= self.limits.breaker_failures:
+                    self._open_until = now + self.limits.breaker_cooldown
+            else:
+                self._failures = 0
+                self.samples.append(latency)
+            if status is None or status in THROTTLE_STATUSES or status >= 500 or retried:
+                self.throttled += 1
+                if retry_after > 0:
+                    self.blocked_until = max(self.blocked_until, now + retry_after)
+                self._decrease(now)
+            else:
+                self._observe_latency(latency, now)
+            self._cond.notify_all()
+
+    def _observe_latency(self, latency: float, now: float) -> None:
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.best_latency is None or self.latency < self.best_latency:
+            self.best_latency = self.latency
+        if self.latency > self.best_latency * self.limits.latency_factor:
+            self._decrease(now)
+        else:
+            # Additive increase: about one more slot per window of successful requests
+            self.limit = min(self.limits.max_concurrency, self.limit + 1.0 / self.limit)
+
+    def _decrease(self, now: float) -> None:
+        # One cut per round trip, so a burst of failures from the same window halves only once
+        if now - self._last_cut < (self.latency or 1.0):
+            return
+        self._last_cut = now
+        self.limit = max(self.limits.min_concurrency, self.limit / 2)
+
+    def percentile(self, pct: float) -> float | None:
+        with self._cond:
+            samples = sorted(self.samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def hedge_delay(self) -> float | None:
+        # How long to wait on a request before sending a duplicate; None while hedging is off or unwarmed
+        if not self.limits.hedge_percentile or len(self.samples) < self.limits.hedge_min_samples:
+            return None
+        return self.percentile(self.limits.hedge_percentile)
+
+    def hedged(self, won: bool) -> None:
+        with self._cond:
+            self.hedges += 1
+            self.hedge_wins += int(won)
+
+    @contextmanager
+    def slot(self, block: bool = True) -> Iterator["Slot"]:
+        self.allow()
+        self.acquire(block)
+        slot = Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except BaseException as e:
+            status = 0 if getattr(e, "host_fault", True) is False else None
+            self.release(status, time.monotonic() - start)
+            raise
+        self.release(slot.status, slot.latency or time.monotonic() - start, slot.retry_after, slot.retried)
+
+    def stats(self) -> dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        with self._cond:
+            return {
+                "concurrency": round(self.limit, 2),
+                "rate": self.rate(),
+                "crawl_delay": self.crawl_delay,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited_s": self.waited_s,
+                "errors": self.errors,
+                "fast_failed": self.fast_failed,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "p50_s": p50,
+                "p95_s": p95,
+                "breaker": "open" if self._open_until > time.monotonic() else "closed",
+            }
+
+
+class Scheduler:
+    def __init__(self, robots_timeout: float = 10.0, throttle: bool = True):
+        # throttle=False keeps breakers, hedging and stats but drops rate limits, robots.txt and AIMD caps
+        self.robots_timeout = robots_timeout
+        self.throttle = throttle
+        self._hosts: dict[str, HostState] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str, limits: HostLimits, user_agent: str) -> HostState:
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            state = self._hosts.get(key)
+            created = state is None
+            if created:
+                state = self._hosts[key] = HostState(key, limits, self.throttle)
+        if not created:
+            state.configure(limits)
+        if self.throttle and state.limits.robots and not state._robots_checked:
+            self._load_robots(state, user_agent)
+        return state
+
+    def _load_robots(self, state: HostState, user_agent: str) -> None:
+        with state._cond:
+            if state._robots_checked:
+                return
+            state._robots_checked = True
+            # Held across the fetch so other requests to this host wait for the crawl delay
+            try:
+                resp = requests.get(
+                    f"{state.host}/robots.txt", headers={"User-Agent": user_agent}, timeout=self.robots_timeout
+                )
+            except requests.RequestException:
+                return
+            if resp.status_code != 200:
+                return
+            state.crawl_delay = robots_delay(resp.text, user_agent)
+
+    def slot(self, url: str, limits: HostLimits, user_agent: str):
+        return self.host(url, limits, user_agent).slot()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {k: s.stats() for k, s in hosts.items()}
+
+
+class Slot:
+    def __init__(self):
+        self.status: int | None = None
+        self.latency: float | None = None
+        self.retry_after = 0.0
+        self.retried = False
+
+    def observe(self, resp: requests.Response) -> None:
+        self.status = resp.status_code
+        self.latency = resp.elapsed.total_seconds()
+        self.retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        # urllib3 retries inside the adapter; a throttled attempt still counts against the host
+        retries = getattr(getattr(resp, "raw", None), "retries", None)
+        history = getattr(retries, "history", None) or ()
+        self.retried = any(h.status in THROTTLE_STATUSES for h in history if h.status)
+
+
+def robots_delay(text: str, user_agent: str) -> float:
+    # urllib.robotparser drops fractional Crawl-delay values and groups without rules, so parse the two directives here
+    groups: list[tuple[list[str], dict[str, float]]] = []
+    agents: list[str] = []
+    in_agents = False
+    for line in text.splitlines():
+        key, _, value = line.split("#", 1)[0].partition(":")
+        key, value = key.strip().lower(), value.strip()
+        if key == "user-agent":
+            if not in_agents:
+                agents = []
+                groups.append((agents, {}))
+                in_agents = True
+            agents.append(value.lower())
+            continue
+        in_agents = False
+        if not groups:
+            continue
+        try:
+            if key == "crawl-delay":
+                groups[-1][1]["delay"] = float(value)
+            elif key == "request-rate":
+                n, _, per = value.partition("/")
+                groups[-1][1]["rate"] = _seconds(per) / float(n)
+        except (ValueError, ZeroDivisionError):
+            continue
+    ua = user_agent.lower()
+    match = next((d for a, d in groups if any(x != "*" and x in ua for x in a)), None)
+    if match is None:
+        match = next((d for a, d in groups if "*" in a), {})
+    return max(match.values(), default=0.0)
+
+
+def _seconds(per: str) -> float:
+    per = per.strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600}
+    if per and per[-1] in units:
+        return float(per[:-1] or 1) * units[per[-1]]
+    return float(per or 1)
+
+
+def parse_retry_after(value: str | None) -> float:
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
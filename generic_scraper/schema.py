@@ -1,8 +1,12 @@
+import json
+import sys
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+CORE_COLUMNS = ["source", "name", "url", "email"]
 
-@dataclass
+
+@dataclass(slots=True)
 class Record:
     source: str
     name: str
@@ -11,21 +15,20 @@ class Record:
     raw: dict[str, Any] = field(default_factory=dict)
 
     def to_flat_dict(self, all_columns: list[str]) -> dict[str, str]:
-        out: dict[str, str] = {c: "" for c in all_columns}
+        out: dict[str, str] = dict.fromkeys(all_columns, "")
         out["source"] = self.source
         out["name"] = str(self.name) if self.name else ""
         out["url"] = str(self.url) if self.url else ""
         out["email"] = str(self.email) if self.email else ""
         prefix = f"{self.source}_"
-        for col in all_columns:
-            if col.startswith(prefix):
-                key = col[len(prefix) :]
-                out[col] = _serialize(self.raw.get(key, ""))
+        for key, val in self.raw.items():
+            col = prefix + key
+            if col in out:
+                out[col] = serialize_value(val)
         return out
 
 
-def _serialize(val: Any) -> str:
-    import json
+def serialize_value(val: Any) -> str:
     if val is None:
         return ""
     if isinstance(val, (list, dict)):
@@ -34,10 +37,100 @@ def _serialize(val: Any) -> str:
 
 
 def collect_all_columns(records: list[Record]) -> list[str]:
-    core = ["source", "name", "url", "email"]
     seen: set[str] = set()
     for r in records:
         for k in r.raw:
             seen.add(f"{r.source}_{k}")
     extra = sorted(seen)
-    return core + extra
+    return CORE_COLUMNS + extra
+
+
+# Marks a raw key a record did not have, as opposed to one holding None
+_MISSING = object()
+
+
+# Column-major records of one source; every row shares the batch's interned key list
+class RecordBatch:
+    __slots__ = ("source", "keys", "_index", "names", "urls", "emails", "values")
+
+    def __init__(self, source: str, keys: Iterable[str] = ()):
+        self.source = sys.intern(str(source))
+        self.keys: list[str] = []
+        self._index: dict[str, int] = {}
+        self.names: list[str] = []
+        self.urls: list[str] = []
+        self.emails: list[str] = []
+        self.values: list[list[Any]] = []
+        for k in keys:
+            self._column(k)
+
+    def _column(self, key: str) -> int:
+        idx = self._index.get(key)
+        if idx is None:
+            idx = len(self.keys)
+            key = sys.intern(key)
+            self.keys.append(key)
+            self._index[key] = idx
+            self.values.append([_MISSING] * len(self.names))
+        return idx
+
+    def append(self, rec: Record) -> None:
+        row = len(self.names)
+        self.names.append(str(rec.name) if rec.name else "")
+        self.urls.append(str(rec.url) if rec.url else "")
+        self.emails.append(str(rec.email) if rec.email else "")
+        for col in self.values:
+            col.append(_MISSING)
+        for key, val in rec.raw.items():
+            self.values[self._column(key)][row] = val
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Record]:
+        for i in range(len(self.names)):
+            raw = {k: col[i] for k, col in zip(self.keys, self.values) if col[i] is not _MISSING}
+            yield Record(source=self.source, name=self.names[i], url=self.urls[i], email=self.emails[i], raw=raw)
+
+    def column(self, key: str) -> list[Any]:
+        idx = self._index.get(key)
+        if idx is None:
+            return [None] * len(self.names)
+        return [None if v is _MISSING else v for v in self.values[idx]]
+
+    def column_names(self) -> list[str]:
+        return [f"{self.source}_{k}" for k in self.keys]
+
+    def csv_rows(self, columns: list[str]) -> Iterator[list[str]]:
+        pos = {c: i for i, c in enumerate(columns)}
+        # Resolve this source's columns to output offsets once, not per row
+        offsets = [(pos[c], col) for c, col in zip(self.column_names(), self.values) if c in pos]
+        core = [pos.get(c) for c in CORE_COLUMNS]
+        width = len(columns)
+        for i in range(len(self.names)):
+            row = [""] * width
+            for off, val in zip(core, (self.source, self.names[i], self.urls[i], self.emails[i])):
+                if off is not None:
+                    row[off] = val
+            for off, col in offsets:
+                val = col[i]
+                if val is not _MISSING:
+                    row[off] = serialize_value(val)
+            yield row
+
+
+def to_batches(records: Iterable[Record]) -> list[RecordBatch]:
+    # Consecutive records of the same source share a batch, so row order is preserved
+    batches: list[RecordBatch] = []
+    for rec in records:
+        if not batches or batches[-1].source != rec.source:
+            batches.append(RecordBatch(rec.source))
+        batches[-1].append(rec)
+    return batches
+
+
+def batch_columns(batches: Iterable[RecordBatch]) -> list[str]:
+    seen: set[str] = set()
+    for b in batches:
+        seen.update(b.column_names())
+    return CORE_COLUMNS + sorted(seen)
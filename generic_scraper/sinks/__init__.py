@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from .base import BaseSink
+from .csv_sink import CsvSink
+from .jsonl_sink import JsonlSink
+from .arrow_sink import ArrowSink, ParquetSink
+from .sqlite_sink import SqliteSink
+
+SINK_REGISTRY = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+    "arrow": ArrowSink,
+    "sqlite": SqliteSink,
+}
+
+_SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+
+
+def sink_format(path: Path) -> str:
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    # Compression suffixes (.gz, .zst) sit after the format suffix
+    for suffix in reversed(suffixes):
+        if suffix in _SUFFIXES:
+            return _SUFFIXES[suffix]
+    return "csv"
+
+
+def get_sink(fmt: str) -> type[BaseSink]:
+    f = fmt.strip().lower()
+    if f not in SINK_REGISTRY:
+        raise ValueError(f"Unknown output format: {fmt}. Known: {list(SINK_REGISTRY)}")
+    return SINK_REGISTRY[f]
+
+
+def open_sink(path: Path, fmt: str | None = None, stream: bool = False) -> BaseSink:
+    return get_sink(fmt or sink_format(path))(path, stream=stream)
@@ -0,0 +1,86 @@
+from typing import Any
+
+from ..schema import CORE_COLUMNS, RecordBatch, serialize_value
+from .base import BaseSink
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow output needs pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def _typed_array(pa, values: list[Any]):
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        # Mixed value types within one key: fall back to the CSV text form
+        return pa.array([None if v is None else serialize_value(v) for v in values], type=pa.string())
+
+
+class _ArrowSink(BaseSink):
+    # Batches are grouped per source and written at close: the file schema needs every source's fields
+    def __init__(self, path, stream: bool = False):
+        super().__init__(path, stream)
+        self._sources: dict[str, list[RecordBatch]] = {}
+
+    def write(self, batch: RecordBatch) -> None:
+        self._sources.setdefault(batch.source, []).append(batch)
+        self.count += len(batch)
+
+    def _tables(self):
+        pa = _pyarrow()
+        structs = {}
+        for source, batches in self._sources.items():
+            keys = list(dict.fromkeys(k for b in batches for k in b.keys))
+            arrays = []
+            for key in keys:
+                values: list[Any] = []
+                for b in batches:
+                    values.extend(b.column(key))
+                arrays.append(_typed_array(pa, values))
+            structs[source] = pa.StructArray.from_arrays(arrays, names=keys) if keys else None
+
+        fields = [pa.field(c, pa.string()) for c in CORE_COLUMNS]
+        fields += [pa.field(s, arr.type) for s, arr in structs.items() if arr is not None]
+        schema = pa.schema(fields)
+
+        tables = []
+        for source, batches in self._sources.items():
+            n = sum(len(b) for b in batches)
+            cols = {
+                "source": pa.array([source] * n, pa.string()),
+                "name": pa.array([x for b in batches for x in b.names], pa.string()),
+                "url": pa.array([x for b in batches for x in b.urls], pa.string()),
+                "email": pa.array([x for b in batches for x in b.emails], pa.string()),
+            }
+            for s, arr in structs.items():
+                if arr is None:
+                    continue
+                cols[s] = arr if s == source else pa.nulls(n, arr.type)
+            tables.append(pa.table(cols, schema=schema))
+        return schema, tables
+
+
+class ParquetSink(_ArrowSink):
+    def close(self) -> None:
+        schema, tables = self._tables()
+        import pyarrow.parquet as pq
+
+        with pq.ParquetWriter(self.path, schema, compression="zstd") as writer:
+            for table in tables:
+                # One row group per source keeps each source's columns contiguous
+                writer.write_table(table, row_group_size=max(1, table.num_rows))
+        self._sources = {}
+
+
+class ArrowSink(_ArrowSink):
+    def close(self) -> None:
+        pa = _pyarrow()
+        schema, tables = self._tables()
+        with pa.OSFile(str(self.path), "wb") as f, pa.ipc.new_file(f, schema) as writer:
+            for table in tables:
+                writer.write_table(table)
+        self._sources = {}
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from ..schema import RecordBatch
+
+
+class BaseSink(ABC):
+    def __init__(self, path: Path, stream: bool = False):
+        self.path = Path(path)
+        self.stream = stream
+        self.count = 0
+
+    def open(self, columns: list[str] | None) -> None:
+        # columns are the flat CSV-style names declared by the configs, or None if unknown
+        pass
+
+    @abstractmethod
+    def write(self, batch: RecordBatch) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "BaseSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
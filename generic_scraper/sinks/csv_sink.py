@@ -0,0 +1,67 @@
+import csv
+import json
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import IO
+
+from ..schema import CORE_COLUMNS, Record, RecordBatch, batch_columns
+from .base import BaseSink
+
+
+class CsvSink(BaseSink):
+    def __init__(self, path: Path, stream: bool = False):
+        super().__init__(path, stream)
+        self.columns: list[str] | None = None
+        self._file: IO[str] | None = None
+        self._spill: IO[str] | None = None
+        self._seen: set[str] = set()
+        self._batches: list[RecordBatch] = []
+
+    def open(self, columns: list[str] | None) -> None:
+        self.columns = columns if self.stream else None
+        if self.columns is not None:
+            self._file = self.path.open("w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.columns)
+        elif self.stream:
+            # Some extractor cannot declare its columns: park records on disk until all are known
+            self._spill = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def write(self, batch: RecordBatch) -> None:
+        self.count += len(batch)
+        if self._file is not None:
+            self._writer.writerows(batch.csv_rows(self.columns))
+            self._file.flush()
+        elif self._spill is not None:
+            self._seen.update(batch.column_names())
+            for r in batch:
+                self._spill.write(json.dumps(asdict(r), ensure_ascii=False) + "\n")
+        else:
+            self._batches.append(batch)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            return
+        if self._spill is not None:
+            self._close_spill()
+            return
+        columns = batch_columns(self._batches)
+        with self.path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for batch in self._batches:
+                writer.writerows(batch.csv_rows(columns))
+        self._batches = []
+
+    def _close_spill(self) -> None:
+        columns = CORE_COLUMNS + sorted(self._seen)
+        spill = self._spill
+        spill.seek(0)
+        with self.path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for line in spill:
+                writer.writerow(Record(**json.loads(line)).to_flat_dict(columns))
+        spill.close()
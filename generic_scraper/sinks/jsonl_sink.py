@@ -0,0 +1,42 @@
+import gzip
+import io
+import json
+from typing import IO
+
+from ..schema import RecordBatch
+from .base import BaseSink
+
+
+def _open_text(path, compression: str) -> IO[str]:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd output needs the zstandard package (pip install zstandard)") from None
+        raw = path.open("wb")
+        return io.TextIOWrapper(zstandard.ZstdCompressor(level=6).stream_writer(raw), encoding="utf-8")
+    return path.open("w", encoding="utf-8")
+
+
+class JsonlSink(BaseSink):
+    def open(self, columns: list[str] | None) -> None:
+        name = self.path.name.lower()
+        if name.endswith(".gz"):
+            compression = "gzip"
+        elif name.endswith((".zst", ".zstd")):
+            compression = "zstd"
+        else:
+            compression = ""
+        self._file = _open_text(self.path, compression)
+
+    def write(self, batch: RecordBatch) -> None:
+        dumps = json.dumps
+        for r in batch:
+            row = {"source": r.source, "name": r.name, "url": r.url, "email": r.email, "raw": r.raw}
+            self._file.write(dumps(row, ensure_ascii=False, default=str) + "\n")
+        self.count += len(batch)
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+from ..schema import Record, RecordBatch
+from .base import BaseSink
+
+# Raw keys tried, in order, for a record's stable id before falling back to its URL
+ID_KEYS = ("id", "member_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    source TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    name TEXT,
+    url TEXT,
+    email TEXT,
+    raw TEXT,
+    content_hash TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    PRIMARY KEY (source, record_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_last_seen ON records (source, last_seen);
+CREATE INDEX IF NOT EXISTS records_changed_at ON records (source, changed_at);
+CREATE INDEX IF NOT EXISTS records_email ON records (email);
+"""
+
+# Unchanged rows only get last_seen bumped; content columns are rewritten when the hash differs
+_UPSERT = """
+INSERT INTO records (source, record_id, name, url, email, raw, content_hash, first_seen, last_seen, changed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, record_id) DO UPDATE SET
+    name = CASE WHEN content_hash = excluded.content_hash THEN name ELSE excluded.name END,
+    url = CASE WHEN content_hash = excluded.content_hash THEN url ELSE excluded.url END,
+    email = CASE WHEN content_hash = excluded.content_hash THEN email ELSE excluded.email END,
+    raw = CASE WHEN content_hash = excluded.content_hash THEN raw ELSE excluded.raw END,
+    changed_at = CASE WHEN content_hash = excluded.content_hash THEN changed_at ELSE excluded.changed_at END,
+    content_hash = excluded.content_hash,
+    last_seen = excluded.last_seen
+"""
+
+
+def record_id(rec: Record, content_hash: str) -> str:
+    for key in ID_KEYS:
+        val = rec.raw.get(key)
+        if val not in (None, ""):
+            return str(val)
+    # Sources without an id or URL are keyed on content, so an edit shows up as a new row
+    return rec.url or content_hash
+
+
+def content_hash(rec: Record, raw_json: str) -> str:
+    payload = "\x1f".join((str(rec.name or ""), str(rec.url or ""), str(rec.email or ""), raw_json))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SqliteSink(BaseSink):
+    def open(self, columns: list[str] | None) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, isolation_level=None)
+        # WAL lets readers query the previous snapshot while a run is writing
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    def write(self, batch: RecordBatch) -> None:
+        now = self.run_at
+        rows = []
+        for rec in batch:
+            raw_json = json.dumps(rec.raw, ensure_ascii=False, sort_keys=True, default=str)
+            digest = content_hash(rec, raw_json)
+            rows.append((
+                rec.source, record_id(rec, digest), rec.name, rec.url, rec.email,
+                raw_json, digest, now, now, now,
+            ))
+        # One transaction per batch keeps commits off the per-row path
+        with _transaction(self._conn):
+            self._conn.executemany(_UPSERT, rows)
+        self.count += len(rows)
+
+    def close(self) -> None:
+        conn = getattr(self, "_conn", None)
+        if conn is None:
+            return
+        conn.execute("PRAGMA optimize")
+        conn.close()
+        self._conn = None
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
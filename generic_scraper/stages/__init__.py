@@ -0,0 +1,53 @@
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import IO, Iterator
+
+from ..schema import CORE_COLUMNS, Record
+from ..sinks import sink_format
+
+# Stages post-process engine output: they read records back from a CSV/JSONL run output,
+# work on the whole corpus at once and write the enriched records through a sink
+
+
+def read_records(path: Path) -> Iterator[Record]:
+    path = Path(path)
+    fmt = sink_format(path)
+    if fmt == "jsonl":
+        with _open_text(path) as f:
+            for line in f:
+                if line.strip():
+                    yield Record(**json.loads(line))
+    elif fmt == "csv":
+        yield from _read_csv(path)
+    else:
+        raise ValueError(f"Stages read csv or jsonl output, not {fmt}: {path}")
+
+
+def _open_text(path: Path) -> IO[str]:
+    name = path.name.lower()
+    if name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if name.endswith((".zst", ".zstd")):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd input needs the zstandard package (pip install zstandard)") from None
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(path.open("rb")), encoding="utf-8")
+    return path.open(encoding="utf-8")
+
+
+def _read_csv(path: Path) -> Iterator[Record]:
+    # Flat columns are "{source}_{key}"; empty cells were absent keys (CSV cannot tell them apart)
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            source = row["source"]
+            prefix = f"{source}_"
+            raw = {
+                col[len(prefix):]: val
+                for col, val in row.items()
+                if col not in CORE_COLUMNS and col.startswith(prefix) and val != ""
+            }
+            yield Record(source=source, name=row["name"], url=row["url"], email=row["email"], raw=raw)
@@ -0,0 +1,199 @@
+import argparse
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from ..engine import write_records
+from ..schema import Record
+from ..sinks import open_sink
+from . import read_records
+
+# Pattern sets are compiled once at import, so each worker process pays for them a single time
+
+_BIO_END = re.compile(r"\s*---\s*|Publications while at OATML")
+_BIO_END_LINE = re.compile(r"\n\s*---\s*\n|Publications while at OATML")
+_PARAGRAPH = re.compile(r"\s{2,}")
+_LEADING_THE = re.compile(r"^the\s+", re.I)
+_LEADING_SEP = re.compile(r"^[:\s]+")
+_SENTENCE_END = re.compile(r"\.\s+")
+_UNTIL_SENTENCE_END = r"(.+?)(?=\.\s+[A-Z]|\.\s*$)"
+
+# Tried in order and the first pattern that matches wins, wherever a later one would match in the line
+_RESEARCH = tuple(
+    re.compile(r"research\s+" + lead + _UNTIL_SENTENCE_END, re.I | re.S)
+    for lead in (
+        r"focus(?:es)?\s+on\s+",
+        r"focus[:\s]+",
+        r"interest(?:s)?[:\s]+",
+        r"interest(?:s)?\s+(?:lies?|span|include)\s+",
+        r"(?:focuses?|interests?)\s+(?:on\s+)?",
+    )
+)
+_RESEARCH_KEYWORDS = ("research focus", "research interest")
+
+# Kept as separate patterns: matches of different patterns may overlap, which one alternation would not allow
+_AFFILIATIONS = tuple(
+    re.compile(p, re.I)
+    for p in (
+        r"(?:at|in)\s+(?:the\s+)?([\w\s]+?(?:University|Institute|College|Group|Department|Centre|Lab)(?:\s+of\s+[\w\s]+)?)",
+        r"(?:,\s*)((?:National\s+)?(?:University|Institute|College)\s+(?:of\s+)?[\w\s]+?)(?:\s*,|\s*\.|$)",
+        r"((?:OATML|Big Data|Turing)\s+(?:AI\s+)?(?:Group|Institute))",
+        r"(Christ Church|St\s+\w+\'?s?\s+College)",
+    )
+)
+
+
+def _sentence(text: str) -> str:
+    return text + ("." if not text.endswith(".") else "")
+
+
+def research_interests(text: str) -> str:
+    description = _BIO_END_LINE.split(text, maxsplit=1)[0]
+    for line in description.split("\n"):
+        line = line.strip()
+        line_lower = line.lower()
+        if not any(kw in line_lower for kw in _RESEARCH_KEYWORDS):
+            continue
+        for pattern in _RESEARCH:
+            m = pattern.search(line)
+            if m and m.group(1).strip():
+                return _sentence(m.group(1).strip())
+        for kw in _RESEARCH_KEYWORDS:
+            idx = line_lower.find(kw)
+            if idx >= 0:
+                after = _LEADING_SEP.sub("", line[idx + len(kw) :])
+                first = _SENTENCE_END.split(after, maxsplit=1)[0].strip()
+                if first:
+                    return _sentence(first)
+        return line
+    return ""
+
+
+def affiliations(text: str) -> str:
+    description = _BIO_END.split(text.replace("\n", " "), maxsplit=1)[0]
+    paras = _PARAGRAPH.split(description.strip())
+    bio_text = " ".join(paras[:2]) if paras else ""
+
+    found = []
+    seen = set()
+    for pattern in _AFFILIATIONS:
+        for m in pattern.finditer(bio_text):
+            aff = _LEADING_THE.sub("", " ".join(m.group(1).split()).rstrip(".,"))
+            if " in the " in aff:
+                continue
+            key = aff.lower()
+            if 4 < len(aff) < 70 and key not in seen:
+                seen.add(key)
+                found.append(aff)
+    if found:
+        return "; ".join(found)
+    return paras[0][:500] if paras else ""
+
+
+ANALYZERS: dict[str, Callable[[str], str]] = {
+    "research_interests": research_interests,
+    "affiliations": affiliations,
+}
+
+# source id -> raw field holding the page text to analyze
+TEXT_SOURCES = {"oxford": "page_text"}
+
+
+def analyze_texts(texts: list[str], names: tuple[str, ...]) -> list[dict[str, str]]:
+    # Runs in a worker process: only the texts cross the process boundary, not the records
+    fns = [(name, ANALYZERS[name]) for name in names]
+    return [{name: fn(text) for name, fn in fns} for text in texts]
+
+
+def iter_analyzed(
+    records: Iterable[Record],
+    sources: dict[str, str] | None = None,
+    names: Iterable[str] | None = None,
+    workers: int | None = None,
+    batch_size: int = 32,
+) -> Iterator[Record]:
+    # Records stream through in their original order; batches of page text are analyzed in
+    # worker processes while the caller keeps pulling (and the engine keeps fetching) the next ones
+    sources = TEXT_SOURCES if sources is None else sources
+    names = tuple(ANALYZERS if names is None else names)
+    unknown = [n for n in names if n not in ANALYZERS]
+    if unknown:
+        raise ValueError(f"Unknown analyzers: {unknown}. Known: {list(ANALYZERS)}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    records = iter(records)
+    batches = iter(lambda: list(islice(records, batch_size)), [])
+    if workers <= 0:
+        for batch in batches:
+            yield from _merge(batch, *_submit(None, batch, sources, names))
+        return
+    window = workers * 2
+    pending: deque[tuple[list[Record], list[Record], Future | None]] = deque()
+    # The engine's fetch and queue threads are already running; forking them could copy a held lock into a worker
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+        try:
+            for batch in batches:
+                pending.append((batch, *_submit(pool, batch, sources, names)))
+                while len(pending) > window:
+                    yield from _merge(*pending.popleft())
+            while pending:
+                yield from _merge(*pending.popleft())
+        finally:
+            for _, _, f in pending:
+                if f is not None:
+                    f.cancel()
+
+
+def _submit(
+    pool: ProcessPoolExecutor | None, batch: list[Record], sources: dict[str, str], names: tuple[str, ...]
+) -> tuple[list[Record], Future | list[dict[str, str]] | None]:
+    targets = [r for r in batch if r.source in sources and r.raw.get(sources[r.source])]
+    if not targets:
+        return targets, None
+    texts = [str(r.raw[sources[r.source]]) for r in targets]
+    if pool is None:
+        return targets, analyze_texts(texts, names)
+    return targets, pool.submit(analyze_texts, texts, names)
+
+
+def _merge(
+    batch: list[Record], targets: list[Record], result: Future | list[dict[str, str]] | None
+) -> list[Record]:
+    if result is not None:
+        results = result.result() if isinstance(result, Future) else result
+        for rec, fields in zip(targets, results):
+            rec.raw.update(fields)
+    return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regex text analysis (affiliations, research interests) over scraper output")
+    parser.add_argument("input", type=Path, help="Run output to read (.csv or .jsonl[.gz|.zst])")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Enriched output; the format follows the extension")
+    parser.add_argument("--analyzers", nargs="*", choices=list(ANALYZERS), help="Analyzers to run (default: all)")
+    parser.add_argument(
+        "--source",
+        action="append",
+        metavar="SOURCE=FIELD",
+        help="Text field per source, replacing the built-in oxford=page_text (repeatable)",
+    )
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes (default: CPU count; 0 runs in-process)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per worker task (default: 32)")
+    args = parser.parse_args()
+
+    sources = dict(s.split("=", 1) for s in args.source) if args.source else None
+    records = iter_analyzed(
+        read_records(args.input), sources, args.analyzers, workers=args.workers, batch_size=args.batch_size
+    )
+    count = write_records(records, open_sink(args.output))
+    print(f"Analyzed {count} records -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from ..engine import write_batches
+from ..schema import Record, to_batches
+from . import read_records
+
+TOPIC_FIELD = "research_topics"
+
+# list_join separators and line breaks end a phrase, so n-grams never span two listed areas
+_SEGMENTS = re.compile(r"[;\n]+")
+
+
+@dataclass(frozen=True, slots=True)
+class TopicSource:
+    field: str
+    # Keep only the lines mentioning this (case-insensitive), e.g. the "interested in ..." part of a bio
+    match: str = ""
+
+    def document(self, rec: Record) -> str:
+        val = rec.raw.get(self.field)
+        if isinstance(val, list):
+            val = "\n".join(str(v) for v in val if v)
+        text = str(val) if val else ""
+        if self.match and text:
+            needle = self.match.lower()
+            text = "\n".join(line for line in text.splitlines() if needle in line.lower())
+        return text
+
+
+# source id -> where its research text lives in the engine output
+TOPIC_SOURCES = {
+    "oxford": TopicSource("page_text", match="interest"),
+    "cmu": TopicSource("rsrc"),
+    "iitm": TopicSource("research"),
+}
+
+
+def _vectorizer(**kwargs: Any):
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+    except ImportError:
+        raise ImportError("The topics stage needs scikit-learn (pip install scikit-learn)") from None
+    return TfidfVectorizer(**kwargs)
+
+
+def top_terms(X, features, top_n: int) -> list[list[str]]:
+    # Highest-weighted terms of every row at once: sort the CSR entries by (row, -weight, term),
+    # rank each entry within its row and keep the first top_n
+    import numpy as np
+
+    X = X.tocsr()
+    n_rows = X.shape[0]
+    rows = np.repeat(np.arange(n_rows), np.diff(X.indptr))
+    order = np.lexsort((X.indices, -X.data, rows))
+    rank = np.arange(order.size) - X.indptr[rows[order]]
+    keep = order[rank < top_n]
+    terms = np.asarray(features, dtype=object)[X.indices[keep]]
+    bounds = np.searchsorted(rows[keep], np.arange(1, n_rows))
+    return [list(t) for t in np.split(terms, bounds)]
+
+
+def research_topics(docs: list[str], top_n: int = 10) -> list[list[str]]:
+    # One vectorizer over the whole corpus, so IDF reflects how rare a term is across people
+    if not docs:
+        return []
+    words = _vectorizer(stop_words="english", ngram_range=(1, 2)).build_analyzer()
+    vectorizer = _vectorizer(
+        analyzer=lambda doc: [t for seg in _SEGMENTS.split(doc) for t in words(seg)], sublinear_tf=True
+    )
+    try:
+        X = vectorizer.fit_transform(docs)
+    except ValueError:
+        # Nothing but stop words in the whole corpus
+        return [[] for _ in docs]
+    return top_terms(X, vectorizer.get_feature_names_out(), top_n)
+
+
+def add_research_topics(
+    records: Iterable[Record],
+    sources: dict[str, TopicSource] | None = None,
+    top_n: int = 10,
+    field: str = TOPIC_FIELD,
+) -> list[Record]:
+    sources = TOPIC_SOURCES if sources is None else sources
+    records = list(records)
+    targets: list[Record] = []
+    docs: list[str] = []
+    for rec in records:
+        src = sources.get(rec.source)
+        doc = src.document(rec) if src is not None else ""
+        if doc:
+            targets.append(rec)
+            docs.append(doc)
+    for rec, terms in zip(targets, research_topics(docs, top_n)):
+        rec.raw[field] = "; ".join(terms)
+    return records
+
+
+def _parse_source(spec: str) -> tuple[str, TopicSource]:
+    source, _, rest = spec.partition("=")
+    field, _, match = rest.partition(":")
+    if not source or not field:
+        raise argparse.ArgumentTypeError(f"expected source=field[:match], got {spec!r}")
+    return source.strip(), TopicSource(field.strip(), match.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add corpus-level TF-IDF research topics to scraper output")
+    parser.add_argument("input", type=Path, help="Run output to read (.csv or .jsonl[.gz|.zst])")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Enriched output; the format follows the extension")
+    parser.add_argument("--top-n", type=int, default=10, help="Terms kept per record (default: 10)")
+    parser.add_argument(
+        "--source",
+        action="append",
+        type=_parse_source,
+        metavar="SOURCE=FIELD[:MATCH]",
+        help="Text field per source, replacing the built-in oxford/cmu/iitm mapping (repeatable)",
+    )
+    parser.add_argument("--field", default=TOPIC_FIELD, help=f"Raw field to write topics to (default: {TOPIC_FIELD})")
+    args = parser.parse_args()
+
+    sources = dict(args.source) if args.source else None
+    records = add_research_topics(read_records(args.input), sources, top_n=args.top_n, field=args.field)
+    write_batches(to_batches(records), args.output)
+    tagged = sum(1 for r in records if args.field in r.raw)
+    print(f"Added {args.field} to {tagged} of {len(records)} records -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
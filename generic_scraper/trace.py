@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Iterator
+
+_NULL_SPAN = nullcontext()
+
+
+class NullTracer:
+    enabled = False
+
+    def span(self, name: str, cat: str = "stage", **args: Any):
+        return _NULL_SPAN
+
+    def request(self, url: str, status: int, nbytes: int, wait_s: float, total_s: float, cached: bool = False) -> None:
+        pass
+
+
+class Tracer(NullTracer):
+    enabled = True
+
+    def __init__(self, slowest: int = 20):
+        self.slowest = slowest
+        self._origin = time.perf_counter()
+        self._events: list[dict[str, Any]] = []
+        self._requests: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, cat: str = "stage", **args: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    def request(self, url: str, status: int, nbytes: int, wait_s: float, total_s: float, cached: bool = False) -> None:
+        entry = {"url": url, "status": status, "bytes": nbytes, "wait_s": wait_s, "total_s": total_s, "cached": cached}
+        with self._lock:
+            self._requests.append(entry)
+
+    def stage_totals(self) -> dict[str, float]:
+        totals: dict[str, float] = defaultdict(float)
+        with self._lock:
+            for e in self._events:
+                if e["cat"] == "stage":
+                    totals[e["name"]] += e["dur"] / 1e6
+        return dict(totals)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            events = list(self._events)
+            requests = list(self._requests)
+        targets = {e["args"].get("target", e["name"]): e["dur"] / 1e6 for e in events if e["cat"] == "target"}
+        slow = sorted(requests, key=lambda r: r["total_s"], reverse=True)[: self.slowest]
+        return {
+            "targets_s": targets,
+            "stages_s": self.stage_totals(),
+            "requests": len(requests),
+            "cached_requests": sum(1 for r in requests if r["cached"]),
+            "bytes": sum(r["bytes"] for r in requests),
+            "wait_s": sum(r["wait_s"] for r in requests),
+            "download_s": sum(r["total_s"] - r["wait_s"] for r in requests),
+            "slowest_urls": slow,
+        }
+
+    def write(self, path: Path, **extra: Any) -> None:
+        with self._lock:
+            events = list(self._events)
+        # Chrome/Perfetto trace-event format; viewers ignore the extra summary key
+        report = {"traceEvents": events, "displayTimeUnit": "ms", "summary": {**self.summary(), **extra}}
+        Path(path).write_text(json.dumps(report, indent=1, default=str), encoding="utf-8")
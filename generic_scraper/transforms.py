@@ -0,0 +1,59 @@
+from typing import Any, Callable
+from urllib.parse import urljoin
+
+Transform = Callable[[Any], Any]
+
+
+def _identity(val: Any) -> Any:
+    return val
+
+
+def _deobfuscate_email(val: Any) -> Any:
+    if isinstance(val, str):
+        return val.replace("[at]", "@").replace("[dot]", ".")
+    return val
+
+
+def _list_join(val: Any) -> Any:
+    if isinstance(val, list):
+        return "; ".join(str(x).strip() for x in val if x)
+    return str(val) if val else ""
+
+
+def _andrew_email(val: Any) -> Any:
+    if val:
+        return f"{val}@andrew.cmu.edu"
+    return ""
+
+
+def _mailto_extract(val: Any) -> Any:
+    if not val:
+        return ""
+    if isinstance(val, str) and "mailto:" in val:
+        return val.replace("mailto:", "").strip()
+    return str(val)
+
+
+def _absolute_url(base: str) -> Transform:
+    def apply(val: Any) -> Any:
+        if val and isinstance(val, str) and not val.startswith("http"):
+            return urljoin(base + "/", val)
+        return val
+
+    return apply
+
+
+TRANSFORMS: dict[str, Transform] = {
+    "raw": _identity,
+    "deobfuscate_email": _deobfuscate_email,
+    "list_join": _list_join,
+    "andrew_email": _andrew_email,
+    "mailto_extract": _mailto_extract,
+}
+
+
+def resolve_transform(name: str | None, base: str = "") -> Transform:
+    # Unknown names fall back to identity, as the extractors always did
+    if name == "absolute_url":
+        return _absolute_url(base)
+    return TRANSFORMS.get(name or "raw", _identity)
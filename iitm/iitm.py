@@ -9,6 +9,7 @@ import bs4
 DATA_DIR = Path(__file__).parent
 BASE_URL = "https://cse.iitm.ac.in/"
 FACULTY_URL = "https://cse.iitm.ac.in/outerfaculty.php"
+TIMEOUT = (10, 30)
 
 
 def _deobfuscate_email(text: str) -> str:
@@ -26,7 +27,7 @@ def _make_absolute(url: str) -> str:
 
 
 def get_data():
-    r = requests.get(FACULTY_URL, headers={"User-Agent": "Mozilla/5.0"})
+    r = requests.get(FACULTY_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
     r.raise_for_status()
     r.encoding = r.apparent_encoding or "utf-8"
 
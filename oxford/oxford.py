@@ -1,73 +1,60 @@
 import csv
-import re
-import requests
-import bs4
 from pathlib import Path
+from typing import Iterator
 from urllib.parse import urljoin, urlparse
-from sklearn.feature_extraction.text import TfidfVectorizer
 
+from generic_scraper.pages import Page, analyzer, fetch_page
+from generic_scraper.schema import Record
+from generic_scraper.stages import text as text_stage
 
-DATA_DIR = Path("basic info")
+
+# Run from the repo root as `python -m oxford.oxford`; output stays next to this file
+DATA_DIR = Path(__file__).resolve().parent / "basic info"
 DATA_DIR.mkdir(exist_ok=True)
 
 
 def get_research_interests(url: str) -> str:
-    page = requests.get(url)
-    page.encoding = page.apparent_encoding or "utf-8"
-    soup = bs4.BeautifulSoup(page.content, "html.parser")
-    elements = soup.select("p")
-    paras = [
-        ele.get_text(strip=True)
-        for ele in elements
-        if "interest" in ele.get_text().lower() or "interested" in ele.get_text().lower()
-    ]
-    if not paras:
-        return ""
-    vectorizer = TfidfVectorizer(stop_words="english", max_features=20, ngram_range=(1, 2))
-    X = vectorizer.fit_transform(paras)
-    features = vectorizer.get_feature_names_out()
-    return "; ".join(features)
+    return research_interests(fetch_page(url))
+
+
+@analyzer("interest_text")
+def interest_text(page: Page) -> str:
+    paras = [ele.get_text(strip=True) for ele in page.soup.select("p")]
+    return "\n".join(p for p in paras if "interest" in p.lower())
+
+
+@analyzer("research_interests")
+def research_interests(page: Page) -> str:
+    # Single page only; get_data scores all members together so IDF means something
+    return batch_research_interests([interest_text(page)])[0]
+
+
+def batch_research_interests(docs: list[str], top_n: int = 20) -> list[str]:
+    # One vectorizer fitted over every member's paragraphs; shares the scraper's topics stage
+    from generic_scraper.stages.topics import research_topics
+
+    return ["; ".join(terms) for terms in research_topics(docs, top_n)]
 
 
 def get_affiliations(url: str) -> str:
-    page = requests.get(url)
-    page.encoding = page.apparent_encoding or "utf-8"
-    soup = bs4.BeautifulSoup(page.content, "html.parser")
-    text = soup.get_text(separator=" ", strip=True)
-
-    description = re.split(r"\s*---\s*|Publications while at OATML", text, maxsplit=1)[0]
-    paras = re.split(r"\s{2,}", description.strip())
-    bio_text = " ".join(paras[:2]) if paras else ""
-
-    affiliations = []
-    patterns = [
-        r"(?:at|in)\s+(?:the\s+)?([\w\s]+?(?:University|Institute|College|Group|Department|Centre|Lab)(?:\s+of\s+[\w\s]+)?)",
-        r"(?:,\s*)((?:National\s+)?(?:University|Institute|College)\s+(?:of\s+)?[\w\s]+?)(?:\s*,|\s*\.|$)",
-        r"((?:OATML|Big Data|Turing)\s+(?:AI\s+)?(?:Group|Institute))",
-        r"(Christ Church|St\s+\w+\'?s?\s+College)",
-    ]
-    seen = set()
-    for pattern in patterns:
-        for m in re.finditer(pattern, bio_text, re.IGNORECASE):
-            aff = " ".join(m.group(1).split()).strip().rstrip(".,")
-            aff = re.sub(r"^the\s+", "", aff, flags=re.I)
-            if " in the " in aff:
-                continue
-            key = aff.lower()
-            if 4 < len(aff) < 70 and key not in seen:
-                seen.add(key)
-                affiliations.append(aff)
-
-    if affiliations:
-        return "; ".join(affiliations)
-
-    return paras[0][:500] if paras else ""
+    return affiliations(fetch_page(url))
+
+
+@analyzer("affiliations")
+def affiliations(page: Page) -> str:
+    return text_stage.affiliations(page.text("\n"))
+
+
+def member_records(name_links: dict[str, str]) -> Iterator[Record]:
+    # Fetched lazily, so later pages download while worker processes run the regexes over earlier ones
+    for name, link in name_links.items():
+        page = fetch_page(link)
+        raw = {"page_text": page.text("\n"), "interest_text": interest_text(page)}
+        yield Record(source="oxford", name=name, url=link, email=mail(page), raw=raw)
 
 
 def get_data(url: str):
-    req = requests.get(url)
-    soup = bs4.BeautifulSoup(req.content, "html.parser")
-    links = soup.find_all("a")
+    links = fetch_page(url).soup.find_all("a")
     name_links = {}
     base_url = f"{urlparse(url).scheme}://{urlparse(url).netloc}"
     for link in links:
@@ -78,12 +65,10 @@ def get_data(url: str):
                 member_url = urljoin(base_url + "/", href.lstrip("./"))
                 name_links[name] = member_url
 
-    rows = []
-    for name, link in name_links.items():
-        email = get_mail(link)
-        research_interest = get_research_interests(link)
-        affiliations = get_affiliations(link)
-        rows.append((name, email, research_interest, affiliations))
+    # A few dozen members, so small batches keep every worker process busy
+    members = list(text_stage.iter_analyzed(member_records(name_links), names=("affiliations",), batch_size=8))
+    interests = batch_research_interests([r.raw["interest_text"] for r in members])
+    rows = [(r.name, r.email, topics, r.raw.get("affiliations", "")) for r, topics in zip(members, interests)]
 
     output_file = DATA_DIR / "v5_oxford_basic.csv"
     with output_file.open("w", newline="", encoding="utf-8") as f:
@@ -94,12 +79,19 @@ def get_data(url: str):
 
 
 def get_mail(url: str):
-    page = requests.get(url)
-    soup = bs4.BeautifulSoup(page.content, "html.parser")
-    elements = soup.find_all("a")
-    emails = [ele.attrs.get("href") for ele in elements if ele.attrs.get("href") and "mailto" in str(ele.attrs.get("href"))]
+    return mail(fetch_page(url))
+
+
+@analyzer("email")
+def mail(page: Page) -> str:
+    emails = [h for h in page.hrefs if "mailto" in h]
     return emails[0] if emails else ""
 
 
+@analyzer("links")
+def all_links(page: Page) -> str:
+    return "; ".join(page.hrefs)
+
+
 if __name__ == "__main__":
     get_data("https://oatml.cs.ox.ac.uk/members.html")
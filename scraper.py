@@ -15,6 +15,8 @@ OXFORD_URL = "https://oatml.cs.ox.ac.uk/members.html"
 CMU_INDEX_URL = "https://ml.cmu.edu/peopleindexes/phd-students-index.v1.json"
 IITM_URL = "https://cse.iitm.ac.in/outerfaculty.php"
 IITM_BASE = "https://cse.iitm.ac.in/"
+# (connect, read) seconds
+TIMEOUT = (10, 30)
 
 
 def _raw_val(val):
@@ -26,7 +28,7 @@ def _raw_val(val):
 
 
 def scrape_oxford():
-    req = requests.get(OXFORD_URL, headers={"User-Agent": "Mozilla/5.0"})
+    req = requests.get(OXFORD_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
     req.encoding = req.apparent_encoding or "utf-8"
     soup = bs4.BeautifulSoup(req.content, "html.parser")
     links = soup.find_all("a")
@@ -43,20 +45,13 @@ def scrape_oxford():
     rows = []
     for member_id, member_url in name_links.items():
         try:
-            page = requests.get(member_url, headers={"User-Agent": "Mozilla/5.0"})
+            page = requests.get(member_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
             page.encoding = page.apparent_encoding or "utf-8"
             soup = bs4.BeautifulSoup(page.content, "html.parser")
             text = soup.get_text(separator="\n", strip=True)
 
-            mailto_raw = []
-            for a in soup.find_all("a", href=True):
-                h = a.get("href", "")
-                if "mailto" in str(h):
-                    mailto_raw.append(str(h))
-
-            all_links_raw = []
-            for a in soup.find_all("a", href=True):
-                all_links_raw.append(str(a.get("href", "")))
+            all_links_raw = [str(a.get("href", "")) for a in soup.find_all("a", href=True)]
+            mailto_raw = [h for h in all_links_raw if "mailto" in h]
 
             desc_raw = text
             if "Publications while at OATML" in text:
@@ -142,7 +137,7 @@ def scrape_oxford():
 
 
 def scrape_cmu():
-    r = requests.get(CMU_INDEX_URL, headers={"User-Agent": "Mozilla/5.0"})
+    r = requests.get(CMU_INDEX_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
     r.raise_for_status()
     data = json.loads(r.text)
     students = data.get("data", [])
@@ -196,7 +191,7 @@ def scrape_cmu():
 
 
 def scrape_iitm():
-    r = requests.get(IITM_URL, headers={"User-Agent": "Mozilla/5.0"})
+    r = requests.get(IITM_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=TIMEOUT)
     r.raise_for_status()
     r.encoding = r.apparent_encoding or "utf-8"
     soup = bs4.BeautifulSoup(r.content, "html.parser")